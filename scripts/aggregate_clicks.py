@@ -0,0 +1,43 @@
+"""Fold sealed click event segments into per-link rollups."""
+from __future__ import annotations
+
+import argparse
+import os
+import pathlib
+import sys
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.append(str(SRC_PATH))
+
+from models.click_aggregator import ClickAggregator
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Aggregate AuroraLink Forge click segments")
+    parser.add_argument("directory", help="Directory containing sealed *.jsonl click segments")
+    parser.add_argument("--state", help="Rollup state file to merge into and rewrite")
+    parser.add_argument("--delete", action="store_true", help="Remove segments once folded into --state")
+    args = parser.parse_args()
+    if args.delete and not args.state:
+        parser.error("--delete requires --state so folded segments are not lost")
+    return args
+
+
+def main() -> None:
+    args = parse_args()
+    aggregator = ClickAggregator()
+    if args.state:
+        aggregator.load_state(args.state)
+    segments = aggregator.fold_directory(args.directory)
+    if args.state:
+        aggregator.save_state(args.state)
+    print(aggregator.to_json())
+    if args.delete:
+        for path in segments:
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
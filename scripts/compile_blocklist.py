@@ -0,0 +1,42 @@
+"""Compile a domain blocklist into the memory-mappable artifact used by validate_url."""
+from __future__ import annotations
+
+import argparse
+import json
+import pathlib
+import sys
+from typing import Iterator
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.append(str(SRC_PATH))
+
+from utils.blocklist import compile_blocklist
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compile an AuroraLink Forge domain blocklist")
+    parser.add_argument("sources", nargs="+", help="Text files with one domain per line ('#' comments allowed)")
+    parser.add_argument("--output", required=True, help="Path of the compiled artifact")
+    return parser.parse_args()
+
+
+def read_hosts(paths: list[str]) -> Iterator[str]:
+    for path in paths:
+        with open(path, encoding="utf-8") as handle:
+            for line in handle:
+                entry = line.split("#", 1)[0].split()
+                if entry:
+                    # Accept hosts-file lines such as "0.0.0.0 evil.example".
+                    yield entry[-1]
+
+
+def main() -> None:
+    args = parse_args()
+    count = compile_blocklist(read_hosts(args.sources), args.output)
+    print(json.dumps({"output": args.output, "domains": count}))
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,7 @@ from typing import Any, Dict
 
 from models.links_repository import LinksRepository
 from utils.config import load_config
+from utils.profiling import profiled
 from utils.responders import configure_logger
 
 CONFIG = load_config()
@@ -22,6 +23,7 @@ def get_repository() -> LinksRepository:
     return REPOSITORY
 
 
+@profiled("cleanup_expired")
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     request_id = getattr(context, "aws_request_id", "unknown")
     now = int(time.time())
@@ -6,7 +6,10 @@ import logging
 from typing import Any, Dict
 
 from models.links_repository import LinksRepository
+from utils.auth import caller_identity
+from utils.blocklist import load_blocklist
 from utils.config import load_config
+from utils.profiling import phase, profiled
 from utils.responders import configure_logger, error, success
 from utils.shortener import encode_base62, normalize_alias, random_suffix
 from utils.validators import validate_alias, validate_ttl, validate_url
@@ -15,6 +18,8 @@ CONFIG = load_config()
 configure_logger(CONFIG.log_level)
 LOGGER = logging.getLogger("auroralink")
 REPOSITORY: LinksRepository | None = None
+# Fail the cold start on a missing or corrupt artifact; validate_url reuses this mapping.
+load_blocklist(CONFIG.blocklist_path)
 
 
 def get_repository() -> LinksRepository:
@@ -39,6 +44,7 @@ def _generate_code(alias: str | None, repo: LinksRepository) -> str:
     return f"{encode_base62(counter_value)}{random_suffix(2)}"
 
 
+@profiled("create_link")
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     request_id = getattr(context, "aws_request_id", "unknown")
     LOGGER.info("create_link_invoked", extra={"requestId": request_id})
@@ -50,12 +56,14 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
 
     destination = (body.get("destination") or "").strip()
     ttl_seconds = body.get("ttlSeconds")
-    owner = body.get("owner") or "anonymous"
+    # Only an authenticated caller becomes a verified owner allowed to edit the link.
+    caller = caller_identity(event)
+    owner = caller or body.get("owner") or "anonymous"
     alias = normalize_alias(body.get("alias"))
 
     url_result = validate_url(destination, CONFIG)
     if not url_result.is_valid:
-        return error(400, "INVALID_URL", url_result.message or "Invalid URL")
+        return error(400, url_result.code or "INVALID_URL", url_result.message or "Invalid URL")
 
     alias_result = validate_alias(alias, CONFIG)
     if not alias_result.is_valid:
@@ -70,13 +78,16 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     repo = get_repository()
 
     try:
-        code = _generate_code(alias, repo)
-        record = repo.create_link(
-            code=code,
-            destination=destination,
-            owner=owner,
-            ttl_seconds=ttl_value,
-        )
+        with phase("next_counter"):
+            code = _generate_code(alias, repo)
+        with phase("create_link"):
+            record = repo.create_link(
+                code=code,
+                destination=destination,
+                owner=owner,
+                ttl_seconds=ttl_value,
+                owner_verified=caller is not None,
+            )
     except ValueError as exc:
         return error(409, "ALIAS_CONFLICT", str(exc))
     except Exception as exc:  # pragma: no cover - logged for ops
@@ -6,6 +6,7 @@ from typing import Any, Dict
 
 from models.links_repository import LinksRepository
 from utils.config import load_config
+from utils.profiling import profiled
 from utils.responders import configure_logger, error, success
 
 CONFIG = load_config()
@@ -21,6 +22,7 @@ def get_repository() -> LinksRepository:
     return REPOSITORY
 
 
+@profiled("link_stats")
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     code = (event.get("pathParameters") or {}).get("code")
     if not code:
@@ -1,28 +1,120 @@
 """Lambda handler for redirecting short links."""
 from __future__ import annotations
 
+import atexit
+import hashlib
 import logging
 import time
 from typing import Any, Dict
 
-from models.links_repository import LinksRepository
+from botocore.config import Config as BotoConfig
+
+from models.change_feed import ChangeFeedPoller
+from models.click_events import ClickEvent, ClickEventBuffer, build_click_sink
+from models.link_cache import LinkCache
+from models.links_repository import LinksRepository, is_backend_failure
+from models.resilient_repository import BackendUnavailableError, ResilientLinksRepository
+from utils.circuit_breaker import CircuitBreaker
 from utils.config import load_config
+from utils.profiling import phase, profiled
 from utils.responders import configure_logger, error, redirect
 
 CONFIG = load_config()
 configure_logger(CONFIG.log_level)
 LOGGER = logging.getLogger("auroralink")
-REPOSITORY: LinksRepository | None = None
+REPOSITORY: ResilientLinksRepository | None = None
+CLICK_BUFFER: ClickEventBuffer | None = None
+# blake2b keys are capped at 64 bytes, so the configured secret is condensed first.
+VISITOR_SECRET = (
+    hashlib.blake2b(CONFIG.click_visitor_secret.encode("utf-8"), digest_size=32).digest()
+    if CONFIG.click_visitor_secret
+    else None
+)
 
 
-def get_repository() -> LinksRepository:
+def get_repository() -> ResilientLinksRepository:
     global REPOSITORY
     if REPOSITORY is None:
-        REPOSITORY = LinksRepository(CONFIG)
+        breaker = CircuitBreaker(
+            "dynamodb",
+            window=CONFIG.breaker_window,
+            min_calls=CONFIG.breaker_min_calls,
+            error_rate=CONFIG.breaker_error_rate,
+            latency_ms=CONFIG.breaker_latency_ms,
+            open_seconds=CONFIG.breaker_open_seconds,
+            is_failure=is_backend_failure,
+        )
+        # Fail fast so the breaker, not boto3's default retry budget, absorbs outages.
+        client_config = BotoConfig(
+            retries={"total_max_attempts": CONFIG.redirect_dynamodb_max_attempts, "mode": "standard"},
+            connect_timeout=CONFIG.redirect_dynamodb_connect_timeout,
+            read_timeout=CONFIG.redirect_dynamodb_read_timeout,
+        )
+        repository = LinksRepository(CONFIG, client_config)
+        cache = LinkCache(CONFIG.link_cache_size)
+        change_feed = ChangeFeedPoller(
+            lambda buckets: breaker.call(repository.read_changes, buckets),
+            cache,
+            bucket_seconds=CONFIG.change_feed_bucket_seconds,
+            poll_seconds=CONFIG.change_feed_poll_seconds,
+            background=True,
+        )
+        REPOSITORY = ResilientLinksRepository(
+            repository,
+            breaker,
+            cache,
+            replay_batch=CONFIG.click_replay_batch,
+            replay_budget_ms=CONFIG.click_replay_budget_ms,
+            fresh_seconds=CONFIG.link_cache_fresh_seconds,
+            change_feed=change_feed,
+        )
     return REPOSITORY
 
 
+def get_click_buffer() -> ClickEventBuffer | None:
+    global CLICK_BUFFER
+    if CLICK_BUFFER is None and CONFIG.click_sink:
+        # One attempt: rejected or failed batches are requeued by the buffer anyway.
+        client_config = BotoConfig(
+            retries={"total_max_attempts": 1, "mode": "standard"},
+            connect_timeout=CONFIG.click_sink_connect_timeout,
+            read_timeout=CONFIG.click_sink_read_timeout,
+        )
+        sink = build_click_sink(
+            CONFIG.click_sink,
+            CONFIG.region_name,
+            CONFIG.click_segment_bytes,
+            CONFIG.click_segment_seconds,
+            client_config,
+        )
+        CLICK_BUFFER = ClickEventBuffer(
+            sink,
+            batch_size=CONFIG.click_batch_size,
+            max_age_seconds=CONFIG.click_flush_seconds,
+        )
+        # Only reached outside Lambda; in Lambda flush_if_due bounds the loss.
+        atexit.register(CLICK_BUFFER.close)
+    return CLICK_BUFFER
+
+
+@profiled("resolve_link")
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    click_buffer = get_click_buffer()
+    if click_buffer is not None:
+        # The flusher thread was frozen since the last invocation; let it write
+        # any due batch while this request is resolved.
+        click_buffer.flush_in_background()
+    try:
+        return _resolve(event, context)
+    finally:
+        # Whatever is still due is written before the sandbox can be recycled,
+        # unless the flusher is busy or the sink has just failed.
+        if click_buffer is not None:
+            with phase("click_flush"):
+                click_buffer.flush_if_due()
+
+
+def _resolve(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     request_id = getattr(context, "aws_request_id", "unknown")
     code = (event.get("pathParameters") or {}).get("code")
     if not code:
@@ -30,7 +122,11 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
 
     repo = get_repository()
 
-    record = repo.get_link(code)
+    try:
+        with phase("get_link"):
+            record = repo.get_link(code)
+    except BackendUnavailableError:
+        return error(503, "BACKEND_UNAVAILABLE", "Link storage is temporarily unavailable")
     if not record:
         return error(404, "NOT_FOUND", "Short link does not exist")
 
@@ -38,11 +134,23 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     if record.get("expiresAt") and record["expiresAt"] < now:
         LOGGER.info("link_expired", extra={"code": code, "requestId": request_id})
         return error(410, "LINK_EXPIRED", "This link has expired")
+    if record.get("disabled"):
+        LOGGER.info("link_disabled", extra={"code": code, "requestId": request_id})
+        return error(410, "LINK_DISABLED", "This link has been disabled")
 
-    updated = repo.increment_clicks(code)
+    try:
+        with phase("increment_clicks"):
+            updated = repo.increment_clicks(code)
+    except BackendUnavailableError:
+        updated = record
     if not updated:
         return error(404, "NOT_FOUND", "Short link no longer exists")
+    if updated.get("disabled"):
+        return error(410, "LINK_DISABLED", "This link has been disabled")
 
     repo.save_click(updated)
+    click_buffer = get_click_buffer()
+    if click_buffer is not None:
+        click_buffer.append(ClickEvent.from_request(code, event, now, VISITOR_SECRET))
     LOGGER.info("redirecting", extra={"code": code, "destination": updated["destination"]})
-    return redirect(updated["destination"], cache_seconds=60)
+    return redirect(updated["destination"], cache_seconds=CONFIG.redirect_cache_seconds)
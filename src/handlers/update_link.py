@@ -0,0 +1,118 @@
+"""Lambda handler for updating or disabling short links."""
+from __future__ import annotations
+
+import json
+import logging
+from typing import Any, Dict
+
+from models.links_repository import LinkOwnershipError, LinksRepository
+from utils.auth import caller_groups, caller_identity
+from utils.blocklist import load_blocklist
+from utils.config import load_config
+from utils.profiling import phase, profiled
+from utils.responders import configure_logger, error, success
+from utils.validators import validate_url
+
+CONFIG = load_config()
+configure_logger(CONFIG.log_level)
+LOGGER = logging.getLogger("auroralink")
+REPOSITORY: LinksRepository | None = None
+# Fail the cold start on a missing or corrupt artifact; validate_url reuses this mapping.
+load_blocklist(CONFIG.blocklist_path)
+
+
+def get_repository() -> LinksRepository:
+    global REPOSITORY
+    if REPOSITORY is None:
+        REPOSITORY = LinksRepository(CONFIG)
+    return REPOSITORY
+
+
+def _parse_body(event: Dict[str, Any]) -> Dict[str, Any]:
+    try:
+        raw_body = event.get("body") or "{}"
+        body = json.loads(raw_body)
+    except json.JSONDecodeError:
+        raise ValueError("Invalid JSON body")
+    if not isinstance(body, dict):
+        raise ValueError("JSON body must be an object")
+    return body
+
+
+@profiled("update_link")
+def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    request_id = getattr(context, "aws_request_id", "unknown")
+    code = (event.get("pathParameters") or {}).get("code")
+    if not code:
+        return error(400, "MISSING_CODE", "Short code path parameter is required")
+
+    caller = caller_identity(event)
+    is_admin = CONFIG.link_admin_group in caller_groups(event)
+    if not caller:
+        return error(401, "UNAUTHORIZED", "Authentication is required to modify links")
+
+    try:
+        body = _parse_body(event)
+    except ValueError as exc:
+        return error(400, "INVALID_PAYLOAD", str(exc))
+
+    if (event.get("httpMethod") or "").upper() == "DELETE":
+        destination, disabled = None, True
+    else:
+        destination = body.get("destination")
+        disabled = body.get("disabled")
+    expected_version = body.get("expectedVersion")
+
+    if destination is None and disabled is None:
+        return error(400, "INVALID_PAYLOAD", "Provide 'destination' and/or 'disabled'")
+    if disabled is not None and not isinstance(disabled, bool):
+        return error(400, "INVALID_PAYLOAD", "'disabled' must be a boolean")
+    if expected_version is not None and (isinstance(expected_version, bool) or not isinstance(expected_version, int)):
+        return error(400, "INVALID_PAYLOAD", "'expectedVersion' must be an integer")
+    if destination is not None:
+        destination = str(destination).strip()
+        url_result = validate_url(destination, CONFIG)
+        if not url_result.is_valid:
+            return error(400, url_result.code or "INVALID_URL", url_result.message or "Invalid URL")
+
+    repo = get_repository()
+    try:
+        with phase("update_link"):
+            record = repo.update_link(
+                code,
+                destination=destination,
+                disabled=disabled,
+                expected_version=expected_version,
+                owner=None if is_admin else caller,
+            )
+    except LinkOwnershipError as exc:
+        return error(403, "FORBIDDEN", str(exc))
+    except ValueError as exc:
+        return error(409, "VERSION_CONFLICT", str(exc))
+    except Exception as exc:  # pragma: no cover - logged for ops
+        LOGGER.exception("update_link_failed", extra={"requestId": request_id})
+        return error(500, "UPDATE_FAILED", "Unable to update short link", {"detail": str(exc)})
+
+    if record is None:
+        return error(404, "NOT_FOUND", "Short link does not exist")
+
+    LOGGER.info(
+        "update_link_succeeded",
+        extra={
+            "code": code,
+            "version": record["version"],
+            "disabled": record.get("disabled", False),
+            "caller": caller,
+            "admin": is_admin,
+        },
+    )
+    return success(
+        200,
+        {
+            "code": record["code"],
+            "destination": record["destination"],
+            "disabled": bool(record.get("disabled", False)),
+            "version": int(record["version"]),
+            "expiresAt": int(record["expiresAt"]),
+        },
+    )
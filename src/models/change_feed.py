@@ -0,0 +1,99 @@
+"""Polls the link change feed and drops invalidated entries from the local cache."""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from models.link_cache import LinkCache
+
+logger = logging.getLogger("auroralink")
+
+
+class ChangeFeedPoller:
+    """Reads ``CHANGES#<bucket>#<shard>`` items written by ``LinksRepository.publish_invalidation``.
+
+    ``maybe_poll`` is called per request and is throttled to once per
+    ``poll_seconds``. Each poll is a single batched read of at most
+    ``max_catchup_buckets + 2`` buckets: the previous bucket is re-read so late or
+    skewed writes near a boundary are not missed, and if more buckets than that
+    were missed the cached records are marked stale synchronously (no I/O)
+    instead of replaying the gap. Stale records no longer answer healthy reads but
+    stay available as the degraded-mode fallback, so a gap caused by a DynamoDB
+    outage does not also take the last-known records with it. With ``background`` the read runs on a daemon thread so it overlaps
+    the request rather than adding to it.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[List[int]], List[Dict[str, Any]]],
+        cache: LinkCache,
+        bucket_seconds: int,
+        poll_seconds: float,
+        max_catchup_buckets: int = 2,
+        background: bool = False,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._fetch = fetch
+        self._cache = cache
+        self._bucket_seconds = bucket_seconds
+        self._poll_seconds = poll_seconds
+        self._max_catchup_buckets = max_catchup_buckets
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._last_poll: Optional[float] = None
+        self._last_bucket: Optional[int] = None
+        self._wake: Optional[threading.Event] = None
+        if background:
+            self._wake = threading.Event()
+            threading.Thread(target=self._run, name="auroralink-change-feed", daemon=True).start()
+
+    def _expire_gap(self, current: int) -> None:
+        # Caller holds the lock.
+        if self._last_bucket is not None and current - self._last_bucket > self._max_catchup_buckets:
+            self._cache.expire()
+            logger.info("change_feed_gap_cache_expired", extra={"buckets": current - self._last_bucket})
+            self._last_bucket = None
+
+    def maybe_poll(self) -> int:
+        """Apply invalidations if a poll is due; returns entries dropped synchronously."""
+        now = self._clock()
+        with self._lock:
+            if self._last_poll is not None and now - self._last_poll < self._poll_seconds:
+                return 0
+            self._last_poll = now
+            self._expire_gap(int(now) // self._bucket_seconds)
+        if self._wake is not None:
+            self._wake.set()
+            return 0
+        return self.poll()
+
+    def poll(self) -> int:
+        """Read the pending buckets with one fetch; returns the number of cache entries dropped."""
+        current = int(self._clock()) // self._bucket_seconds
+        with self._lock:
+            self._expire_gap(current)
+            first = current - 1 if self._last_bucket is None else self._last_bucket - 1
+
+        dropped = 0
+        for change in self._fetch(list(range(first, current + 1))):
+            cached = self._cache.get(change["code"])
+            if cached is not None and int(cached.get("version", 0)) < int(change["version"]):
+                self._cache.discard(change["code"])
+                dropped += 1
+        with self._lock:
+            self._last_bucket = current
+        if dropped:
+            logger.info("link_cache_invalidated", extra={"dropped": dropped})
+        return dropped
+
+    def _run(self) -> None:
+        assert self._wake is not None
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            try:
+                self.poll()
+            except Exception as exc:
+                logger.warning("change_feed_poll_failed", extra={"error": type(exc).__name__})
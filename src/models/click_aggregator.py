@@ -0,0 +1,167 @@
+"""Offline aggregation of click event segments into per-link rollups."""
+from __future__ import annotations
+
+import base64
+import glob
+import json
+import logging
+import os
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from models.click_events import ClickEvent
+from utils.hyperloglog import HyperLogLog
+
+logger = logging.getLogger("auroralink")
+
+
+@dataclass
+class LinkRollup:
+    clicks: int = 0
+    first_seen: Optional[int] = None
+    last_seen: Optional[int] = None
+    countries: Counter = field(default_factory=Counter)
+    referrers: Counter = field(default_factory=Counter)
+    visitors: HyperLogLog = field(default_factory=HyperLogLog)
+
+    def add(self, event: ClickEvent) -> None:
+        self.clicks += 1
+        if self.first_seen is None or event.timestamp < self.first_seen:
+            self.first_seen = event.timestamp
+        if self.last_seen is None or event.timestamp > self.last_seen:
+            self.last_seen = event.timestamp
+        self.countries[event.country or "unknown"] += 1
+        self.referrers[event.referrer or "direct"] += 1
+        if event.visitor:
+            self.visitors.add(int(event.visitor, 16))
+
+    def merge(self, other: "LinkRollup") -> None:
+        self.clicks += other.clicks
+        for stamp in (other.first_seen, other.last_seen):
+            if stamp is None:
+                continue
+            if self.first_seen is None or stamp < self.first_seen:
+                self.first_seen = stamp
+            if self.last_seen is None or stamp > self.last_seen:
+                self.last_seen = stamp
+        self.countries.update(other.countries)
+        self.referrers.update(other.referrers)
+        self.visitors.merge(other.visitors)
+
+    def to_state(self) -> Dict[str, Any]:
+        """Lossless form, including HLL registers, so later runs can merge into it."""
+        return {
+            "clicks": self.clicks,
+            "firstSeen": self.first_seen,
+            "lastSeen": self.last_seen,
+            "countries": dict(self.countries),
+            "referrers": dict(self.referrers),
+            "visitorPrecision": self.visitors.precision,
+            "visitorRegisters": base64.b64encode(self.visitors.to_bytes()).decode("ascii"),
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "LinkRollup":
+        return cls(
+            clicks=state["clicks"],
+            first_seen=state.get("firstSeen"),
+            last_seen=state.get("lastSeen"),
+            countries=Counter(state.get("countries", {})),
+            referrers=Counter(state.get("referrers", {})),
+            visitors=HyperLogLog(
+                state["visitorPrecision"],
+                base64.b64decode(state["visitorRegisters"]),
+            ),
+        )
+
+    def to_dict(self, top: int = 10) -> Dict[str, Any]:
+        return {
+            "clicks": self.clicks,
+            "firstSeen": self.first_seen,
+            "lastSeen": self.last_seen,
+            "uniqueVisitors": self.visitors.count(),
+            "countries": dict(self.countries.most_common(top)),
+            "referrers": dict(self.referrers.most_common(top)),
+        }
+
+
+class ClickAggregator:
+    """Folds newline-delimited click records (local segments or Firehose objects).
+
+    The saved state records which segments it already includes, so re-running over
+    a directory, or crashing between saving and deleting segments, never counts a
+    segment twice. A state file therefore tracks a single segment directory.
+    """
+
+    def __init__(self) -> None:
+        self.rollups: Dict[str, LinkRollup] = {}
+        self.consumed: Set[str] = set()
+        self.malformed = 0
+
+    def fold_lines(self, lines: Iterable[str]) -> None:
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                event = ClickEvent.from_record(line)
+            except (ValueError, KeyError):
+                self.malformed += 1
+                continue
+            rollup = self.rollups.get(event.code)
+            if rollup is None:
+                rollup = self.rollups[event.code] = LinkRollup()
+            rollup.add(event)
+
+    def fold_directory(self, directory: str) -> List[str]:
+        """Fold sealed segments not already consumed.
+
+        Returns every segment path now reflected in the rollups, including ones
+        folded by an earlier run, so callers can safely delete them.
+        """
+        segments = sorted(glob.glob(os.path.join(directory, "*.jsonl")))
+        skipped = 0
+        for path in segments:
+            if os.path.basename(path) in self.consumed:
+                skipped += 1
+                continue
+            with open(path, encoding="utf-8") as handle:
+                self.fold_lines(handle)
+        if skipped:
+            logger.info("click_segments_already_folded", extra={"count": skipped})
+        if self.malformed:
+            logger.warning("click_records_malformed", extra={"count": self.malformed})
+        # Names of segments that have since been deleted can never be folded again.
+        self.consumed = {os.path.basename(path) for path in segments}
+        return segments
+
+    def load_state(self, path: str) -> None:
+        """Merge rollups persisted by ``save_state``; a missing file is an empty state."""
+        if not os.path.exists(path):
+            return
+        with open(path, encoding="utf-8") as handle:
+            saved = json.load(handle)
+        self.consumed.update(saved.get("segments", []))
+        for code, state in saved.get("rollups", {}).items():
+            prior = LinkRollup.from_state(state)
+            rollup = self.rollups.get(code)
+            if rollup is None:
+                self.rollups[code] = prior
+            else:
+                rollup.merge(prior)
+
+    def save_state(self, path: str) -> None:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(
+                {
+                    "segments": sorted(self.consumed),
+                    "rollups": {code: rollup.to_state() for code, rollup in self.rollups.items()},
+                },
+                handle,
+            )
+        os.replace(tmp_path, path)
+
+    def to_json(self) -> str:
+        return json.dumps({code: rollup.to_dict() for code, rollup in self.rollups.items()}, default=str)
@@ -0,0 +1,320 @@
+"""Click event capture: compact records, batched sinks, and a background flusher."""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional, Protocol
+
+logger = logging.getLogger("auroralink")
+
+_FIREHOSE_MAX_RECORDS = 500
+_VISITOR_KEY_ROTATION_SECONDS = 24 * 3600
+
+
+def visitor_digest(secret: bytes, now: int, source_ip: str, user_agent: str) -> str:
+    """Keyed visitor ID under a key derived from ``secret`` and the current UTC day.
+
+    Without the secret the 2^32 IPv4 space cannot be enumerated against stored IDs,
+    and because the key changes daily, IDs cannot be linked across days.
+    """
+    day = now // _VISITOR_KEY_ROTATION_SECONDS
+    day_key = hashlib.blake2b(str(day).encode("ascii"), key=secret, digest_size=32).digest()
+    digest = hashlib.blake2b(f"{source_ip}|{user_agent}".encode("utf-8"), key=day_key, digest_size=8)
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class ClickEvent:
+    code: str
+    timestamp: int
+    referrer: Optional[str] = None
+    user_agent: Optional[str] = None
+    country: Optional[str] = None
+    visitor: Optional[str] = None
+
+    @classmethod
+    def from_request(
+        cls,
+        code: str,
+        event: Dict[str, Any],
+        now: int,
+        visitor_secret: Optional[bytes] = None,
+    ) -> "ClickEvent":
+        headers = {key.lower(): value for key, value in (event.get("headers") or {}).items()}
+        identity = (event.get("requestContext") or {}).get("identity") or {}
+        user_agent = headers.get("user-agent") or identity.get("userAgent")
+        source_ip = identity.get("sourceIp") or ""
+        visitor = None
+        if visitor_secret and (source_ip or user_agent):
+            visitor = visitor_digest(visitor_secret, now, source_ip, user_agent or "")
+        return cls(
+            code=code,
+            timestamp=now,
+            referrer=headers.get("referer"),
+            user_agent=user_agent,
+            country=headers.get("cloudfront-viewer-country"),
+            visitor=visitor,
+        )
+
+    def to_record(self) -> str:
+        payload = {
+            "c": self.code,
+            "t": self.timestamp,
+            "r": self.referrer,
+            "ua": self.user_agent,
+            "cc": self.country,
+            "v": self.visitor,
+        }
+        return json.dumps({k: v for k, v in payload.items() if v is not None}, separators=(",", ":"))
+
+    @classmethod
+    def from_record(cls, line: str) -> "ClickEvent":
+        payload = json.loads(line)
+        return cls(
+            code=payload["c"],
+            timestamp=payload["t"],
+            referrer=payload.get("r"),
+            user_agent=payload.get("ua"),
+            country=payload.get("cc"),
+            visitor=payload.get("v"),
+        )
+
+
+class ClickSink(Protocol):
+    def write_batch(self, records: List[str]) -> List[str]:
+        """Persist records and return any that were rejected and should be retried."""
+        ...
+
+    def rotate(self, force: bool = False) -> None:
+        """Seal buffered output that is old enough (or all of it when ``force``)."""
+        ...
+
+
+class FirehoseClickSink:
+    def __init__(self, stream_name: str, region_name: str, client_config: Any = None) -> None:
+        self._stream_name = stream_name
+        self._region_name = region_name
+        self._client_config = client_config
+        self._client: Any = None
+
+    def write_batch(self, records: List[str]) -> List[str]:
+        if self._client is None:
+            import boto3
+
+            self._client = boto3.client("firehose", region_name=self._region_name, config=self._client_config)
+        rejected: List[str] = []
+        for start in range(0, len(records), _FIREHOSE_MAX_RECORDS):
+            chunk = records[start:start + _FIREHOSE_MAX_RECORDS]
+            response = self._client.put_record_batch(
+                DeliveryStreamName=self._stream_name,
+                Records=[{"Data": f"{record}\n".encode("utf-8")} for record in chunk],
+            )
+            if response.get("FailedPutCount"):
+                rejected.extend(
+                    record
+                    for record, result in zip(chunk, response["RequestResponses"])
+                    if result.get("ErrorCode")
+                )
+        return rejected
+
+    def rotate(self, force: bool = False) -> None:
+        return None
+
+
+class SegmentedFileClickSink:
+    """Append-only newline-delimited segments.
+
+    The active segment is written as ``*.open`` and renamed to ``*.jsonl`` once it
+    exceeds ``segment_bytes`` or has been open for ``segment_seconds``, so readers
+    only ever see sealed, immutable files.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_bytes: int = 4 * 1024 * 1024,
+        segment_seconds: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._directory = directory
+        self._segment_bytes = segment_bytes
+        self._segment_seconds = segment_seconds
+        self._clock = clock
+        self._active: Optional[str] = None
+        self._opened_at = 0.0
+        self._sequence = 0
+
+    def _new_segment(self) -> str:
+        self._sequence += 1
+        name = f"clicks-{time.time_ns()}-{os.getpid()}-{self._sequence:06d}.open"
+        return os.path.join(self._directory, name)
+
+    def write_batch(self, records: List[str]) -> List[str]:
+        os.makedirs(self._directory, exist_ok=True)
+        if self._active is None:
+            self._active = self._new_segment()
+            self._opened_at = self._clock()
+        with open(self._active, "a", encoding="utf-8") as handle:
+            handle.write("".join(f"{record}\n" for record in records))
+            size = handle.tell()
+        if size >= self._segment_bytes:
+            self.seal()
+        else:
+            self.rotate()
+        return []
+
+    def rotate(self, force: bool = False) -> None:
+        if self._active is not None and (force or self._clock() - self._opened_at >= self._segment_seconds):
+            self.seal()
+
+    def seal(self) -> None:
+        if self._active is None:
+            return
+        os.replace(self._active, self._active[: -len(".open")] + ".jsonl")
+        self._active = None
+
+
+def build_click_sink(
+    target: str,
+    region_name: str,
+    segment_bytes: int,
+    segment_seconds: float,
+    client_config: Any = None,
+) -> ClickSink:
+    if target.startswith("firehose://"):
+        return FirehoseClickSink(target[len("firehose://"):], region_name, client_config)
+    return SegmentedFileClickSink(target, segment_bytes, segment_seconds)
+
+
+class ClickEventBuffer:
+    """Collects click records in memory and hands them to the sink in batches.
+
+    Appends only take a lock. A daemon thread writes a batch once it is full or
+    ``max_age_seconds`` old, but Lambda freezes that thread between invocations.
+    Handlers therefore call ``flush_in_background`` when an invocation starts, so
+    a batch left by the previous one is written while the request runs, and
+    ``flush_if_due`` before returning. The latter never waits for a flush already
+    in progress, sends at most one batch, and is skipped for ``max_age_seconds``
+    after a failed write, so a slow or failing sink costs a request at most one
+    sink call. While the sink is healthy, after any invocation fewer than
+    ``batch_size`` records, all younger than ``max_age_seconds``, are pending;
+    that is the most a recycled sandbox can lose. Pending records are capped so a
+    failing sink cannot grow memory without bound, and the oldest are dropped
+    first.
+    """
+
+    def __init__(
+        self,
+        sink: ClickSink,
+        batch_size: int = 100,
+        max_age_seconds: float = 2.0,
+        max_pending: int = 10000,
+        background: bool = True,
+    ) -> None:
+        self._sink = sink
+        self._batch_size = batch_size
+        self._max_age = max_age_seconds
+        self._pending: Deque[str] = deque(maxlen=max_pending)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._oldest: Optional[float] = None
+        self._retry_at = 0.0
+        self.dropped = 0
+        if background:
+            threading.Thread(target=self._run, name="auroralink-clicks", daemon=True).start()
+
+    def append(self, event: ClickEvent) -> None:
+        record = event.to_record()
+        with self._lock:
+            if len(self._pending) == self._pending.maxlen:
+                self.dropped += 1
+            self._pending.append(record)
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            if len(self._pending) >= self._batch_size:
+                self._wake.set()
+
+    def _take(self, limit: Optional[int] = None) -> List[str]:
+        with self._lock:
+            if limit is None or limit >= len(self._pending):
+                records = list(self._pending)
+                self._pending.clear()
+                self._oldest = None
+            else:
+                # The remainder keeps the old timestamp, so it is due again at once.
+                records = [self._pending.popleft() for _ in range(limit)]
+            return records
+
+    def _requeue(self, records: List[str]) -> None:
+        with self._lock:
+            newer = list(self._pending)
+            self._pending.clear()
+            self._pending.extend(records)
+            self._pending.extend(newer)
+            self._oldest = self._oldest or time.monotonic()
+
+    def flush(self, limit: Optional[int] = None, blocking: bool = True) -> int:
+        """Write up to ``limit`` pending records; returns the number of records sent.
+
+        With ``blocking=False`` nothing is written if another flush is in progress.
+        """
+        if not self._flush_lock.acquire(blocking=blocking):
+            return 0
+        try:
+            records = self._take(limit)
+            if not records:
+                return 0
+            try:
+                rejected = self._sink.write_batch(records)
+            except Exception:
+                logger.exception("click_flush_failed", extra={"pending": len(records)})
+                self._requeue(records)
+                self._retry_at = time.monotonic() + self._max_age
+                return 0
+            if rejected:
+                logger.warning("click_records_rejected", extra={"rejected": len(rejected)})
+                self._requeue(rejected)
+            return len(records) - len(rejected)
+        finally:
+            self._flush_lock.release()
+
+    def _due(self) -> bool:
+        with self._lock:
+            return self._oldest is not None and (
+                len(self._pending) >= self._batch_size
+                or time.monotonic() - self._oldest >= self._max_age
+            )
+
+    def flush_in_background(self) -> None:
+        """Hand a due batch to the daemon thread so it is written alongside the request."""
+        if self._due():
+            self._wake.set()
+
+    def flush_if_due(self) -> int:
+        """Flush one due batch without waiting on another flush, and seal aged sink output."""
+        sent = 0
+        if self._due() and time.monotonic() >= self._retry_at:
+            sent = self.flush(limit=self._batch_size, blocking=False)
+        try:
+            self._sink.rotate()
+        except Exception:
+            logger.exception("click_sink_rotate_failed")
+        return sent
+
+    def close(self) -> None:
+        self.flush()
+        self._sink.rotate(force=True)
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self._max_age)
+            self._wake.clear()
+            if self._due():
+                self.flush()
@@ -0,0 +1,51 @@
+"""In-process LRU cache of link records."""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class LinkCache:
+    def __init__(self, max_entries: int = 10000, clock: Callable[[], float] = time.monotonic) -> None:
+        self._max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, code: str, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Return the cached record, or None if missing or older than ``max_age`` seconds."""
+        with self._lock:
+            entry = self._entries.get(code)
+            if entry is None:
+                return None
+            stored_at, record = entry
+            if max_age is not None and self._clock() - stored_at > max_age:
+                return None
+            self._entries.move_to_end(code)
+            return record
+
+    def put(self, code: str, record: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[code] = (self._clock(), record)
+            self._entries.move_to_end(code)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, code: str) -> None:
+        with self._lock:
+            self._entries.pop(code, None)
+
+    def expire(self) -> None:
+        """Keep entries for fallback reads, but fail every ``max_age`` check until re-put."""
+        with self._lock:
+            for code, (_, record) in self._entries.items():
+                self._entries[code] = (float("-inf"), record)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -2,27 +2,62 @@
 from __future__ import annotations
 
 import datetime as dt
+import hashlib
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 import boto3
-from botocore.exceptions import ClientError
+from botocore.config import Config as BotoConfig
+from botocore.exceptions import ClientError, ConnectionError as BotoConnectionError, HTTPClientError
 
 from utils.config import AppConfig
 
 logger = logging.getLogger("auroralink")
 
+CHANGE_FEED_RETENTION_SECONDS = 24 * 3600
+# Each bucket is spread over this many partition keys so a bulk takedown neither
+# concentrates on one hot key nor grows a single item towards the 400 KB limit.
+CHANGE_FEED_SHARDS = 16
+_BATCH_GET_MAX_KEYS = 100
+_BACKEND_ERROR_CODES = {
+    "ProvisionedThroughputExceededException",
+    "ThrottlingException",
+    "RequestLimitExceeded",
+    "InternalServerError",
+    "ServiceUnavailable",
+}
+
+
+class LinkOwnershipError(Exception):
+    """Raised when a caller tries to modify a link it does not own."""
+
+
+def is_backend_failure(exc: Exception) -> bool:
+    """True for throttling, 5xx and connection/timeout errors; False for caller-caused errors."""
+    if isinstance(exc, ClientError):
+        status = exc.response.get("ResponseMetadata", {}).get("HTTPStatusCode") or 0
+        return exc.response.get("Error", {}).get("Code") in _BACKEND_ERROR_CODES or status >= 500
+    return isinstance(exc, (BotoConnectionError, HTTPClientError))
+
 
 class LinksRepository:
-    def __init__(self, config: AppConfig) -> None:
+    def __init__(self, config: AppConfig, client_config: Optional[BotoConfig] = None) -> None:
         self._config = config
-        self._dynamodb = boto3.resource("dynamodb", region_name=config.region_name)
+        self._dynamodb = boto3.resource("dynamodb", region_name=config.region_name, config=client_config)
         self._table = self._dynamodb.Table(config.table_name)
 
     @staticmethod
     def _pk(code: str) -> str:
         return f"LINK#{code}"
 
+    def change_bucket(self, now_ts: int) -> int:
+        return now_ts // self._config.change_feed_bucket_seconds
+
+    @staticmethod
+    def change_shard(code: str) -> int:
+        digest = hashlib.blake2b(code.encode("utf-8"), digest_size=2).digest()
+        return int.from_bytes(digest, "little") % CHANGE_FEED_SHARDS
+
     def next_counter(self) -> int:
         client = boto3.client("dynamodb", region_name=self._config.region_name)
         response = client.update_item(
@@ -40,6 +75,7 @@ class LinksRepository:
         destination: str,
         owner: str,
         ttl_seconds: int,
+        owner_verified: bool = False,
     ) -> Dict[str, Any]:
         expires_at = int(dt.datetime.utcnow().timestamp()) + ttl_seconds
         item = {
@@ -51,7 +87,10 @@ class LinksRepository:
             "expiresAt": expires_at,
             "clicks": 0,
             "owner": owner,
+            "version": 1,
         }
+        if owner_verified:
+            item["ownerVerified"] = True
         try:
             self._table.put_item(
                 Item=item,
@@ -67,12 +106,12 @@ class LinksRepository:
         response = self._table.get_item(Key={"PK": self._pk(code), "SK": "METADATA"})
         return response.get("Item")
 
-    def increment_clicks(self, code: str) -> Optional[Dict[str, Any]]:
+    def increment_clicks(self, code: str, amount: int = 1) -> Optional[Dict[str, Any]]:
         try:
             response = self._table.update_item(
                 Key={"PK": self._pk(code), "SK": "METADATA"},
                 UpdateExpression="SET clicks = clicks + :inc",
-                ExpressionAttributeValues={":inc": 1},
+                ExpressionAttributeValues={":inc": amount},
                 ReturnValues="ALL_NEW",
             )
         except ClientError as exc:
@@ -81,6 +120,113 @@ class LinksRepository:
             raise
         return response.get("Attributes")
 
+    def update_link(
+        self,
+        code: str,
+        destination: Optional[str] = None,
+        disabled: Optional[bool] = None,
+        expected_version: Optional[int] = None,
+        owner: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Apply a versioned update and publish an invalidation for it.
+
+        When ``owner`` is given the write is conditioned on the stored owner, which
+        must have come from an authenticated create (``ownerVerified``).
+        Returns None when the link does not exist, raises LinkOwnershipError when
+        the owner differs and ValueError when ``expected_version`` no longer
+        matches the stored version.
+        """
+        assignments = ["version = if_not_exists(version, :zero) + :one", "updatedAt = :now"]
+        values: Dict[str, Any] = {
+            ":zero": 0,
+            ":one": 1,
+            ":now": dt.datetime.utcnow().isoformat() + "Z",
+        }
+        if destination is not None:
+            assignments.append("destination = :destination")
+            values[":destination"] = destination
+        if disabled is not None:
+            assignments.append("disabled = :disabled")
+            values[":disabled"] = disabled
+
+        condition = "attribute_exists(PK)"
+        if owner is not None:
+            condition += " AND #owner = :owner AND ownerVerified = :verified"
+            values[":owner"] = owner
+            values[":verified"] = True
+        if expected_version == 0:
+            condition += " AND attribute_not_exists(version)"
+        elif expected_version is not None:
+            condition += " AND version = :expected"
+            values[":expected"] = expected_version
+
+        try:
+            response = self._table.update_item(
+                Key={"PK": self._pk(code), "SK": "METADATA"},
+                UpdateExpression="SET " + ", ".join(assignments),
+                ConditionExpression=condition,
+                ExpressionAttributeValues=values,
+                ReturnValues="ALL_NEW",
+                **({"ExpressionAttributeNames": {"#owner": "owner"}} if owner is not None else {}),
+            )
+        except ClientError as exc:
+            if exc.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                current = self.get_link(code)
+                if current is None:
+                    return None
+                if owner is not None and (current.get("owner") != owner or not current.get("ownerVerified")):
+                    raise LinkOwnershipError("Caller does not own this link") from exc
+                raise ValueError("Link version has changed") from exc
+            raise
+        item = response["Attributes"]
+        try:
+            self.publish_invalidation(code, int(item["version"]))
+        except ClientError:
+            # The update is committed; caches converge once their freshness window lapses.
+            logger.exception("invalidation_publish_failed", extra={"code": code})
+        return item
+
+    def publish_invalidation(self, code: str, version: int) -> None:
+        now_ts = int(dt.datetime.utcnow().timestamp())
+        self._table.update_item(
+            Key={"PK": f"CHANGES#{self.change_bucket(now_ts)}#{self.change_shard(code)}", "SK": "FEED"},
+            UpdateExpression=(
+                "SET changes = list_append(if_not_exists(changes, :empty), :entry), "
+                "expiresAt = if_not_exists(expiresAt, :expires)"
+            ),
+            ExpressionAttributeValues={
+                ":empty": [],
+                ":entry": [{"code": code, "version": version, "at": now_ts}],
+                ":expires": now_ts + CHANGE_FEED_RETENTION_SECONDS,
+            },
+        )
+
+    def read_changes(self, buckets: List[int]) -> List[Dict[str, Any]]:
+        """Read every shard of several change-feed buckets with batched gets."""
+        keys = [
+            {"PK": f"CHANGES#{bucket}#{shard}", "SK": "FEED"}
+            for bucket in buckets
+            for shard in range(CHANGE_FEED_SHARDS)
+        ]
+        changes: List[Dict[str, Any]] = []
+        for start in range(0, len(keys), _BATCH_GET_MAX_KEYS):
+            changes.extend(self._batch_get_changes(keys[start:start + _BATCH_GET_MAX_KEYS]))
+        return changes
+
+    def _batch_get_changes(self, keys: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        table_name = self._config.table_name
+        request: Dict[str, Any] = {table_name: {"Keys": keys, "ProjectionExpression": "changes"}}
+        changes: List[Dict[str, Any]] = []
+        for _ in range(3):
+            response = self._dynamodb.batch_get_item(RequestItems=request)
+            for item in response.get("Responses", {}).get(table_name, []):
+                changes.extend(item.get("changes", []))
+            request = response.get("UnprocessedKeys") or {}
+            if not request:
+                return changes
+        # Leave the poller's position unchanged so the buckets are read again.
+        raise RuntimeError("Change feed buckets left unprocessed")
+
     def purge_expired(self, now_ts: int) -> int:
         response = self._table.scan(
             FilterExpression="expiresAt < :now",
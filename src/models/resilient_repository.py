@@ -0,0 +1,164 @@
+"""Degraded-mode wrapper that keeps redirects serving while DynamoDB is unhealthy."""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Optional
+
+from models.change_feed import ChangeFeedPoller
+from models.link_cache import LinkCache
+from models.links_repository import LinksRepository, is_backend_failure
+from utils.circuit_breaker import CLOSED, CircuitBreaker, CircuitOpenError
+
+logger = logging.getLogger("auroralink")
+
+
+class BackendUnavailableError(RuntimeError):
+    """The backend is failing and no last-known record can stand in for it."""
+
+
+class ResilientLinksRepository:
+    """Routes redirect-path calls through a circuit breaker.
+
+    Successful reads refresh a last-known-record cache. When a call fails or the
+    circuit is open, reads are answered from that cache and click increments are
+    parked in a replay buffer. A code's own deferred clicks ride along on its next
+    successful increment; other codes are replayed after healthy increments within
+    a small time budget, and dropped if DynamoDB rejects them as invalid.
+
+    With ``fresh_seconds`` set, cached records also answer healthy reads for that
+    long; the optional change feed evicts records updated or disabled elsewhere.
+    """
+
+    def __init__(
+        self,
+        repository: LinksRepository,
+        breaker: CircuitBreaker,
+        cache: LinkCache,
+        replay_batch: int = 5,
+        replay_budget_ms: int = 20,
+        max_replay_codes: int = 10000,
+        fresh_seconds: float = 0,
+        change_feed: Optional[ChangeFeedPoller] = None,
+    ) -> None:
+        self._repository = repository
+        self._breaker = breaker
+        self._cache = cache
+        self._replay_batch = replay_batch
+        self._replay_budget = replay_budget_ms / 1000.0
+        self._max_replay_codes = max_replay_codes
+        self._fresh_seconds = fresh_seconds
+        self._change_feed = change_feed
+        self._deferred: Counter[str] = Counter()
+        # Code whose read just failed over; its increment skips a second backend wait.
+        self._degraded_code: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @property
+    def deferred_clicks(self) -> int:
+        with self._lock:
+            return sum(self._deferred.values())
+
+    def get_link(self, code: str) -> Optional[Dict[str, Any]]:
+        self._sync_invalidations()
+        if self._fresh_seconds:
+            cached = self._cache.get(code, max_age=self._fresh_seconds)
+            if cached is not None:
+                return cached
+        try:
+            record = self._breaker.call(self._repository.get_link, code)
+        except Exception as exc:
+            if not self._degradable(exc):
+                raise
+            record = self._fallback(code, "get_link", exc)
+            self._degraded_code = code
+            return record
+        self._degraded_code = None
+        if record is None:
+            self._cache.discard(code)
+        else:
+            self._cache.put(code, record)
+        return record
+
+    def increment_clicks(self, code: str) -> Optional[Dict[str, Any]]:
+        if self._degraded_code == code:
+            self._degraded_code = None
+            self._defer(code)
+            return self._cache.get(code)
+        with self._lock:
+            pending = self._deferred.pop(code, 0)
+        try:
+            updated = self._breaker.call(self._repository.increment_clicks, code, 1 + pending)
+        except Exception as exc:
+            if not self._degradable(exc):
+                raise
+            self._defer(code, 1 + pending)
+            return self._fallback(code, "increment_clicks", exc)
+        if updated is not None:
+            self._cache.put(code, updated)
+        self.replay()
+        return updated
+
+    def save_click(self, item: Dict[str, Any]) -> None:
+        self._repository.save_click(item)
+
+    def _sync_invalidations(self) -> None:
+        if self._change_feed is None:
+            return
+        try:
+            self._change_feed.maybe_poll()
+        except Exception as exc:
+            logger.warning("change_feed_poll_failed", extra={"error": type(exc).__name__})
+
+    @staticmethod
+    def _degradable(exc: Exception) -> bool:
+        return isinstance(exc, CircuitOpenError) or is_backend_failure(exc)
+
+    def _fallback(self, code: str, operation: str, exc: Exception) -> Optional[Dict[str, Any]]:
+        if not isinstance(exc, CircuitOpenError):
+            logger.warning(
+                "backend_call_failed",
+                extra={"operation": operation, "code": code, "error": type(exc).__name__},
+            )
+        record = self._cache.get(code)
+        if record is None:
+            raise BackendUnavailableError(f"{operation} unavailable for {code}") from exc
+        logger.info("serving_stale_record", extra={"operation": operation, "code": code})
+        return record
+
+    def _defer(self, code: str, amount: int = 1) -> None:
+        with self._lock:
+            if code in self._deferred or len(self._deferred) < self._max_replay_codes:
+                self._deferred[code] += amount
+                return
+        logger.warning("click_replay_buffer_full", extra={"code": code})
+
+    def replay(self) -> int:
+        """Apply deferred increments within the replay budget; returns how many codes were replayed."""
+        if self._breaker.state != CLOSED:
+            return 0
+        deadline = time.monotonic() + self._replay_budget
+        replayed = 0
+        while replayed < self._replay_batch and time.monotonic() < deadline:
+            with self._lock:
+                if not self._deferred:
+                    break
+                code, amount = self._deferred.popitem()
+            try:
+                self._breaker.call(self._repository.increment_clicks, code, amount)
+            except Exception as exc:
+                if self._degradable(exc):
+                    self._defer(code, amount)
+                    break
+                # e.g. the link was purged; retrying can never succeed.
+                logger.warning(
+                    "click_replay_dropped",
+                    extra={"code": code, "clicks": amount, "error": type(exc).__name__},
+                )
+                continue
+            replayed += 1
+        if replayed:
+            logger.info("clicks_replayed", extra={"codes": replayed, "remaining": len(self._deferred)})
+        return replayed
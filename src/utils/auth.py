@@ -0,0 +1,21 @@
+"""Caller identity helpers for API Gateway Cognito-authorized requests."""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+
+def _claims(event: Dict[str, Any]) -> Dict[str, Any]:
+    return ((event.get("requestContext") or {}).get("authorizer") or {}).get("claims") or {}
+
+
+def caller_identity(event: Dict[str, Any]) -> Optional[str]:
+    claims = _claims(event)
+    return claims.get("cognito:username") or claims.get("sub")
+
+
+def caller_groups(event: Dict[str, Any]) -> List[str]:
+    groups = _claims(event).get("cognito:groups") or []
+    if isinstance(groups, str):
+        # REST API authorizers flatten the list, e.g. "[a, b]" or "a,b".
+        groups = groups.strip("[]").replace(",", " ").split()
+    return list(groups)
@@ -0,0 +1,149 @@
+"""Memory-mapped destination domain blocklist.
+
+A host list is compiled offline into a flat artifact:
+
+    header   magic (4s) | version (u32) | count (u64)
+    index    65537 x u32 offsets into the hash table, bucketed by the top 16 hash bits
+    hashes   count x u64 sorted 64-bit blake2b digests of normalised domains
+
+All integers are little-endian. Loading only maps the file, so cold starts do not
+parse the list, and a lookup costs one bucketed binary search per host label.
+"""
+from __future__ import annotations
+
+import bisect
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Dict, Iterable, Optional
+
+_MAGIC = b"ALBL"
+_VERSION = 1
+_HEADER = struct.Struct("<4sIQ")
+_BUCKET_BITS = 16
+_BUCKETS = 1 << _BUCKET_BITS
+_INDEX_BYTES = (_BUCKETS + 1) * 4
+
+
+def normalize_host(host: str) -> str:
+    """Lower-case and IDNA-encode ``host``; raises ValueError for unencodable names."""
+    host = host.strip().lower().rstrip(".")
+    if host.startswith("*."):
+        host = host[2:]
+    host = host.lstrip(".")
+    if not host:
+        return host
+    # Unicode and punycode spellings of a domain must hash identically.
+    return host.encode("idna").decode("ascii").lower()
+
+
+def _normalized_hosts(hosts: Iterable[str]) -> Iterable[str]:
+    for host in hosts:
+        try:
+            normalized = normalize_host(host)
+        except ValueError:
+            continue
+        if normalized:
+            yield normalized
+
+
+def hash_host(host: str) -> int:
+    digest = hashlib.blake2b(host.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def _little_endian(values: array) -> bytes:
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def compile_blocklist(hosts: Iterable[str], path: str) -> int:
+    """Compile domains into the artifact at ``path`` and return the entry count."""
+    hashes = array("Q", sorted({hash_host(host) for host in _normalized_hosts(hosts)}))
+    index = array("I", [0] * (_BUCKETS + 1))
+    for value in hashes:
+        index[(value >> (64 - _BUCKET_BITS)) + 1] += 1
+    for bucket in range(_BUCKETS):
+        index[bucket + 1] += index[bucket]
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as handle:
+        handle.write(_HEADER.pack(_MAGIC, _VERSION, len(hashes)))
+        handle.write(_little_endian(index))
+        handle.write(_little_endian(hashes))
+    os.replace(tmp_path, path)
+    return len(hashes)
+
+
+class DomainBlocklist:
+    """Read-only view of a compiled artifact.
+
+    Raises OSError when the file cannot be mapped and ValueError when it is not a
+    complete artifact of this version, so a bad deploy fails at load time rather
+    than on a lookup.
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < _HEADER.size + _INDEX_BYTES:
+            raise ValueError(f"Truncated blocklist artifact: {path}")
+        magic, version, count = _HEADER.unpack_from(self._mmap, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"Unsupported blocklist artifact: {path}")
+        if len(self._mmap) != _HEADER.size + _INDEX_BYTES + count * 8:
+            raise ValueError(f"Blocklist artifact size does not match its entry count: {path}")
+        view = memoryview(self._mmap)
+        index_view = view[_HEADER.size:_HEADER.size + _INDEX_BYTES]
+        hash_view = view[_HEADER.size + _INDEX_BYTES:_HEADER.size + _INDEX_BYTES + count * 8]
+        if sys.byteorder == "little":
+            self._index = index_view.cast("I")
+            self._hashes = hash_view.cast("Q")
+        else:  # pragma: no cover - Lambda runtimes are little-endian
+            self._index = array("I", index_view.tobytes())
+            self._index.byteswap()
+            self._hashes = array("Q", hash_view.tobytes())
+            self._hashes.byteswap()
+        if self._index[0] != 0 or self._index[_BUCKETS] != count:
+            raise ValueError(f"Corrupt blocklist index: {path}")
+        self.count = count
+
+    def _contains_hash(self, value: int) -> bool:
+        bucket = value >> (64 - _BUCKET_BITS)
+        lo, hi = self._index[bucket], self._index[bucket + 1]
+        pos = bisect.bisect_left(self._hashes, value, lo, hi)
+        return pos < hi and self._hashes[pos] == value
+
+    def match(self, host: str) -> Optional[str]:
+        """Return the blocked domain covering ``host`` (itself or a parent), if any.
+
+        Raises ValueError when ``host`` cannot be IDNA-encoded.
+        """
+        host = normalize_host(host)
+        while host:
+            if self._contains_hash(hash_host(host)):
+                return host
+            _, _, host = host.partition(".")
+        return None
+
+
+_blocklists: Dict[str, DomainBlocklist] = {}
+
+
+def load_blocklist(path: str) -> Optional[DomainBlocklist]:
+    """Map and cache the blocklist artifact; an empty path disables blocking.
+
+    Handlers call this at import so a missing or corrupt artifact fails the cold
+    start instead of every request.
+    """
+    if not path:
+        return None
+    blocklist = _blocklists.get(path)
+    if blocklist is None:
+        blocklist = _blocklists[path] = DomainBlocklist(path)
+    return blocklist
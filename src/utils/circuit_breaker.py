@@ -0,0 +1,123 @@
+"""Rolling-window circuit breaker for backend calls."""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Tuple, TypeVar
+
+logger = logging.getLogger("auroralink")
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling the backend while the circuit is open."""
+
+
+class CircuitBreaker:
+    """Trips when the error or slow-call rate over the last ``window`` calls is too high.
+
+    After ``open_seconds`` a single probe call is let through (half-open); its outcome
+    either closes the circuit or re-opens it for another cool-down. Only exceptions
+    accepted by ``is_failure`` count against the backend; others propagate unrecorded.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window: int = 20,
+        min_calls: int = 5,
+        error_rate: float = 0.5,
+        latency_ms: int = 300,
+        slow_rate: float = 0.5,
+        open_seconds: float = 30.0,
+        is_failure: Callable[[Exception], bool] = lambda exc: True,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self._min_calls = min_calls
+        self._error_rate = error_rate
+        self._latency = latency_ms / 1000.0
+        self._slow_rate = slow_rate
+        self._open_seconds = open_seconds
+        self._is_failure = is_failure
+        self._clock = clock
+        self._outcomes: Deque[Tuple[bool, bool]] = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and self._clock() - self._opened_at >= self._open_seconds:
+                return HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN:
+                if self._clock() - self._opened_at < self._open_seconds:
+                    return False
+                self._state = HALF_OPEN
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def call(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        if not self.allow():
+            raise CircuitOpenError(f"Circuit '{self.name}' is open")
+        started = self._clock()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as exc:
+            if self._is_failure(exc):
+                self._record(failed=True, slow=False)
+            else:
+                self._release_probe()
+            raise
+        self._record(failed=False, slow=self._clock() - started > self._latency)
+        return result
+
+    def _release_probe(self) -> None:
+        with self._lock:
+            self._probing = False
+
+    def _record(self, failed: bool, slow: bool) -> None:
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probing = False
+                if failed or slow:
+                    self._trip("probe_failed" if failed else "probe_slow")
+                else:
+                    self._state = CLOSED
+                    self._outcomes.clear()
+                    logger.info("circuit_closed", extra={"circuit": self.name})
+                return
+            if self._state == OPEN:
+                return
+            self._outcomes.append((failed, slow))
+            calls = len(self._outcomes)
+            if calls < self._min_calls:
+                return
+            errors = sum(1 for outcome in self._outcomes if outcome[0])
+            slow_calls = sum(1 for outcome in self._outcomes if outcome[1])
+            if errors / calls >= self._error_rate:
+                self._trip("error_rate", errors=errors, calls=calls)
+            elif slow_calls / calls >= self._slow_rate:
+                self._trip("latency", slow=slow_calls, calls=calls)
+
+    def _trip(self, reason: str, **stats: int) -> None:
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self._outcomes.clear()
+        logger.warning("circuit_opened", extra={"circuit": self.name, "reason": reason, **stats})
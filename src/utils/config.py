@@ -19,6 +19,13 @@ def _get_int(value: Optional[str], default: int) -> int:
         return default
 
 
+def _get_float(value: Optional[str], default: float) -> float:
+    try:
+        return float(value) if value is not None else default
+    except ValueError:
+        return default
+
+
 @dataclass(frozen=True)
 class AppConfig:
     table_name: str
@@ -31,6 +38,36 @@ class AppConfig:
     log_level: str
     cleanup_batch_size: int
     region_name: str
+    profile_enabled: bool
+    profile_threshold_ms: int
+    profile_sample_rate: float
+    profile_interval_ms: int
+    profile_sink: str
+    blocklist_path: str
+    click_sink: str
+    click_batch_size: int
+    click_flush_seconds: float
+    click_segment_bytes: int
+    click_segment_seconds: float
+    click_visitor_secret: str
+    click_sink_connect_timeout: float
+    click_sink_read_timeout: float
+    breaker_window: int
+    breaker_min_calls: int
+    breaker_error_rate: float
+    breaker_latency_ms: int
+    breaker_open_seconds: float
+    link_cache_size: int
+    redirect_dynamodb_max_attempts: int
+    redirect_dynamodb_connect_timeout: float
+    redirect_dynamodb_read_timeout: float
+    click_replay_batch: int
+    click_replay_budget_ms: int
+    link_cache_fresh_seconds: float
+    change_feed_bucket_seconds: int
+    change_feed_poll_seconds: float
+    redirect_cache_seconds: int
+    link_admin_group: str
 
 
 _config: Optional[AppConfig] = None
@@ -53,5 +90,35 @@ def load_config() -> AppConfig:
         log_level=os.getenv("LOG_LEVEL", "INFO"),
         cleanup_batch_size=_get_int(os.getenv("CLEANUP_BATCH_SIZE"), 100),
         region_name=os.getenv("AWS_REGION", os.getenv("AWS_DEFAULT_REGION", "us-east-1")),
+        profile_enabled=_get_bool(os.getenv("PROFILE_ENABLED"), False),
+        profile_threshold_ms=_get_int(os.getenv("PROFILE_THRESHOLD_MS"), 500),
+        profile_sample_rate=_get_float(os.getenv("PROFILE_SAMPLE_RATE"), 0.0),
+        profile_interval_ms=_get_int(os.getenv("PROFILE_INTERVAL_MS"), 5),
+        profile_sink=os.getenv("PROFILE_SINK", "/tmp/auroralink-profiles"),
+        blocklist_path=os.getenv("BLOCKLIST_PATH", ""),
+        click_sink=os.getenv("CLICK_SINK", ""),
+        click_batch_size=_get_int(os.getenv("CLICK_BATCH_SIZE"), 100),
+        click_flush_seconds=_get_float(os.getenv("CLICK_FLUSH_SECONDS"), 2.0),
+        click_segment_bytes=_get_int(os.getenv("CLICK_SEGMENT_BYTES"), 4 * 1024 * 1024),
+        click_segment_seconds=_get_float(os.getenv("CLICK_SEGMENT_SECONDS"), 60.0),
+        click_visitor_secret=os.getenv("CLICK_VISITOR_SECRET", ""),
+        click_sink_connect_timeout=_get_float(os.getenv("CLICK_SINK_CONNECT_TIMEOUT"), 0.5),
+        click_sink_read_timeout=_get_float(os.getenv("CLICK_SINK_READ_TIMEOUT"), 1.0),
+        breaker_window=_get_int(os.getenv("BREAKER_WINDOW"), 20),
+        breaker_min_calls=_get_int(os.getenv("BREAKER_MIN_CALLS"), 5),
+        breaker_error_rate=_get_float(os.getenv("BREAKER_ERROR_RATE"), 0.5),
+        breaker_latency_ms=_get_int(os.getenv("BREAKER_LATENCY_MS"), 300),
+        breaker_open_seconds=_get_float(os.getenv("BREAKER_OPEN_SECONDS"), 30.0),
+        link_cache_size=_get_int(os.getenv("LINK_CACHE_SIZE"), 10000),
+        redirect_dynamodb_max_attempts=_get_int(os.getenv("REDIRECT_DYNAMODB_MAX_ATTEMPTS"), 2),
+        redirect_dynamodb_connect_timeout=_get_float(os.getenv("REDIRECT_DYNAMODB_CONNECT_TIMEOUT"), 0.5),
+        redirect_dynamodb_read_timeout=_get_float(os.getenv("REDIRECT_DYNAMODB_READ_TIMEOUT"), 1.0),
+        click_replay_batch=_get_int(os.getenv("CLICK_REPLAY_BATCH"), 5),
+        click_replay_budget_ms=_get_int(os.getenv("CLICK_REPLAY_BUDGET_MS"), 20),
+        link_cache_fresh_seconds=_get_float(os.getenv("LINK_CACHE_FRESH_SECONDS"), 300.0),
+        change_feed_bucket_seconds=max(1, _get_int(os.getenv("CHANGE_FEED_BUCKET_SECONDS"), 10)),
+        change_feed_poll_seconds=_get_float(os.getenv("CHANGE_FEED_POLL_SECONDS"), 5.0),
+        redirect_cache_seconds=_get_int(os.getenv("REDIRECT_CACHE_SECONDS"), 60),
+        link_admin_group=os.getenv("LINK_ADMIN_GROUP", "link-admins"),
     )
     return _config
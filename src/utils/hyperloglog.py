@@ -0,0 +1,41 @@
+"""Minimal HyperLogLog for unique-visitor estimates."""
+from __future__ import annotations
+
+import math
+
+
+class HyperLogLog:
+    """HyperLogLog sketch over pre-hashed 64-bit values (standard error ~1.04/sqrt(2^p))."""
+
+    def __init__(self, precision: int = 12, registers: bytes | None = None) -> None:
+        if not 4 <= precision <= 16:
+            raise ValueError("Precision must be between 4 and 16")
+        self.precision = precision
+        size = 1 << precision
+        if registers is not None and len(registers) != size:
+            raise ValueError("Register size does not match precision")
+        self._registers = bytearray(registers) if registers is not None else bytearray(size)
+
+    def add(self, value: int) -> None:
+        index = value >> (64 - self.precision)
+        remainder = value & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - remainder.bit_length() + 1
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> None:
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge sketches with different precision")
+        self._registers = bytearray(map(max, self._registers, other._registers))
+
+    def count(self) -> int:
+        size = len(self._registers)
+        alpha = 0.7213 / (1 + 1.079 / size)
+        estimate = alpha * size * size / sum(2.0 ** -rank for rank in self._registers)
+        zeros = self._registers.count(0)
+        if estimate <= 2.5 * size and zeros:
+            estimate = size * math.log(size / zeros)
+        return int(round(estimate))
+
+    def to_bytes(self) -> bytes:
+        return bytes(self._registers)
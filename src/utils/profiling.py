@@ -0,0 +1,232 @@
+"""Opt-in stack-sampling profiler for slow handler invocations."""
+from __future__ import annotations
+
+import contextlib
+import functools
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Iterator, Optional, Protocol
+
+from .config import AppConfig, load_config
+
+logger = logging.getLogger("auroralink")
+_LOCAL = threading.local()
+
+
+class ProfileSink(Protocol):
+    def write(self, name: str, collapsed: str, metadata: Dict[str, Any]) -> None:
+        ...
+
+
+class LocalDirProfileSink:
+    """Writes `<name>.collapsed` plus a `<name>.json` metadata sidecar."""
+
+    def __init__(self, directory: str) -> None:
+        self._directory = directory
+
+    def write(self, name: str, collapsed: str, metadata: Dict[str, Any]) -> None:
+        os.makedirs(self._directory, exist_ok=True)
+        base = os.path.join(self._directory, name)
+        with open(f"{base}.collapsed", "w", encoding="utf-8") as handle:
+            handle.write(collapsed)
+        with open(f"{base}.json", "w", encoding="utf-8") as handle:
+            json.dump(metadata, handle, separators=(",", ":"))
+
+
+class S3ProfileSink:
+    """Uploads collapsed stacks to S3 with the metadata stored as object metadata."""
+
+    def __init__(self, bucket: str, prefix: str, region_name: str) -> None:
+        self._bucket = bucket
+        self._prefix = prefix.strip("/")
+        self._region_name = region_name
+        self._client: Any = None
+
+    def write(self, name: str, collapsed: str, metadata: Dict[str, Any]) -> None:
+        if self._client is None:
+            import boto3
+
+            self._client = boto3.client("s3", region_name=self._region_name)
+        key = f"{self._prefix}/{name}.collapsed" if self._prefix else f"{name}.collapsed"
+        self._client.put_object(
+            Bucket=self._bucket,
+            Key=key,
+            Body=collapsed.encode("utf-8"),
+            ContentType="text/plain",
+            Metadata={k: json.dumps(v, separators=(",", ":")) for k, v in metadata.items()},
+        )
+
+
+def build_sink(target: str, region_name: str) -> ProfileSink:
+    if target.startswith("s3://"):
+        bucket, _, prefix = target[len("s3://"):].partition("/")
+        return S3ProfileSink(bucket, prefix, region_name)
+    return LocalDirProfileSink(target)
+
+
+def _frame_label(frame: Any) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class _Capture:
+    def __init__(self, thread_id: int, delay: float) -> None:
+        self.thread_id = thread_id
+        self.delay = delay
+        self.done = threading.Event()
+        self.lock = threading.Lock()
+        self.stacks: Counter[str] = Counter()
+
+    def record(self, frame: Any) -> None:
+        labels = []
+        while frame is not None:
+            labels.append(_frame_label(frame))
+            frame = frame.f_back
+        if labels:
+            self.stacks[";".join(reversed(labels))] += 1
+
+    def stop(self) -> None:
+        with self.lock:
+            self.done.set()
+
+
+class _StackSampler:
+    """Single daemon thread that samples the invoking thread once a capture's delay elapses."""
+
+    def __init__(self, interval_seconds: float) -> None:
+        self._interval = interval_seconds
+        self._captures: "queue.SimpleQueue[_Capture]" = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="auroralink-profiler", daemon=True)
+        self._thread.start()
+
+    def submit(self, capture: _Capture) -> None:
+        self._captures.put(capture)
+
+    def _run(self) -> None:
+        while True:
+            capture = self._captures.get()
+            if capture.done.wait(capture.delay):
+                continue
+            while True:
+                with capture.lock:
+                    if capture.done.is_set():
+                        break
+                    capture.record(sys._current_frames().get(capture.thread_id))
+                if capture.done.wait(self._interval):
+                    break
+
+
+class InvocationProfiler:
+    def __init__(
+        self,
+        sink: ProfileSink,
+        threshold_ms: int,
+        sample_rate: float = 0.0,
+        interval_ms: int = 5,
+    ) -> None:
+        self._sink = sink
+        self._threshold = threshold_ms / 1000.0
+        self._sample_rate = sample_rate
+        self._interval_ms = interval_ms
+        self._sampler: Optional[_StackSampler] = None
+
+    def _get_sampler(self) -> _StackSampler:
+        if self._sampler is None:
+            self._sampler = _StackSampler(self._interval_ms / 1000.0)
+        return self._sampler
+
+    def wrap(self, name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(func)
+        def wrapper(event: Any, context: Any) -> Any:
+            sampled = self._sample_rate > 0 and random.random() < self._sample_rate
+            capture = _Capture(threading.get_ident(), 0.0 if sampled else self._threshold)
+            self._get_sampler().submit(capture)
+            phases: Dict[str, float] = {}
+            previous = getattr(_LOCAL, "phases", None)
+            _LOCAL.phases = phases
+            started = time.perf_counter()
+            try:
+                return func(event, context)
+            finally:
+                duration = time.perf_counter() - started
+                capture.stop()
+                _LOCAL.phases = previous
+                if capture.stacks:
+                    request_id = getattr(context, "aws_request_id", "unknown")
+                    self._emit(name, request_id, duration, phases, capture, sampled)
+
+        return wrapper
+
+    def _emit(
+        self,
+        name: str,
+        request_id: str,
+        duration: float,
+        phases: Dict[str, float],
+        capture: _Capture,
+        sampled: bool,
+    ) -> None:
+        collapsed = "".join(f"{stack} {count}\n" for stack, count in capture.stacks.items())
+        metadata = {
+            "handler": name,
+            "requestId": request_id,
+            "durationMs": round(duration * 1000, 3),
+            "phases": {key: round(value * 1000, 3) for key, value in phases.items()},
+            "trigger": "sample" if sampled else "threshold",
+            "samples": sum(capture.stacks.values()),
+            "intervalMs": self._interval_ms,
+        }
+        try:
+            self._sink.write(f"{name}-{request_id}", collapsed, metadata)
+        except Exception:  # pragma: no cover - profiling must never fail a request
+            logger.exception("profile_write_failed", extra={"handler": name, "requestId": request_id})
+            return
+        logger.info("profile_captured", extra=metadata)
+
+
+@contextlib.contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Time a named section of the active invocation for the profile metadata."""
+    phases: Optional[Dict[str, float]] = getattr(_LOCAL, "phases", None)
+    if phases is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        phases[name] = phases.get(name, 0.0) + time.perf_counter() - started
+
+
+_profiler: Optional[InvocationProfiler] = None
+
+
+def get_profiler(config: AppConfig) -> InvocationProfiler:
+    global _profiler
+    if _profiler is None:
+        _profiler = InvocationProfiler(
+            sink=build_sink(config.profile_sink, config.region_name),
+            threshold_ms=config.profile_threshold_ms,
+            sample_rate=config.profile_sample_rate,
+            interval_ms=config.profile_interval_ms,
+        )
+    return _profiler
+
+
+def profiled(name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorate a Lambda entry point; a no-op unless PROFILE_ENABLED is set."""
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        config = load_config()
+        if not config.profile_enabled:
+            return func
+        return get_profiler(config).wrap(name, func)
+
+    return decorator
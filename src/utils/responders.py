@@ -76,7 +76,7 @@ def error(status_code: int, code: str, message: str, details: Optional[Dict[str,
     payload: Dict[str, Any] = {"error": {"code": code, "message": message}}
     if details:
         payload["error"]["details"] = details
-    logger.warning("error_response", extra={"code": code, "message": message, "details": details})
+    logger.warning("error_response", extra={"code": code, "errorMessage": message, "details": details})
     return success(status_code, payload)
 
 
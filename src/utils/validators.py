@@ -1,20 +1,25 @@
 """Input validation helpers."""
 from __future__ import annotations
 
+import ipaddress
 import re
 from dataclasses import dataclass
 from typing import Optional
+from urllib.parse import urlsplit
 
+from .blocklist import load_blocklist, normalize_host
 from .config import AppConfig
 
 _URL_REGEX = re.compile(r"^(https?://)[^\s]+$", re.IGNORECASE)
 _ALIAS_REGEX = re.compile(r"^[A-Za-z0-9_-]+$")
+_HOST_REGEX = re.compile(r"^[a-z0-9_.-]+$")
 
 
 @dataclass
 class ValidationResult:
     is_valid: bool
     message: Optional[str] = None
+    code: Optional[str] = None
 
 
 def validate_url(url: Optional[str], config: AppConfig) -> ValidationResult:
@@ -22,11 +27,40 @@ def validate_url(url: Optional[str], config: AppConfig) -> ValidationResult:
         return ValidationResult(False, "Destination URL is required")
     if len(url) > config.max_url_length:
         return ValidationResult(False, "URL exceeds maximum length")
-    if not _URL_REGEX.match(url.strip()):
+    url = url.strip()
+    if not _URL_REGEX.match(url):
         return ValidationResult(False, "URL must start with http:// or https://")
+    authority = re.split(r"[/?#]", url.split("://", 1)[1], maxsplit=1)[0]
+    # Browsers read "\" as "/" and percent-decode hosts; urlsplit does neither, so
+    # such authorities would be checked against a different host than is visited.
+    if "\\" in authority or "%" in authority:
+        return ValidationResult(False, "URL host is malformed")
+    try:
+        hostname = urlsplit(url).hostname
+    except ValueError:
+        return ValidationResult(False, "URL host is malformed")
+    if not hostname:
+        return ValidationResult(False, "URL host is required")
+    try:
+        host = normalize_host(hostname)
+    except ValueError:
+        return ValidationResult(False, "URL host is malformed")
+    if not _HOST_REGEX.match(host) and not _is_ip_address(hostname):
+        return ValidationResult(False, "URL host is malformed")
+    blocklist = load_blocklist(config.blocklist_path)
+    if blocklist is not None and blocklist.match(host):
+        return ValidationResult(False, "Destination domain is blocked", "BLOCKED_DESTINATION")
     return ValidationResult(True)
 
 
+def _is_ip_address(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return True
+
+
 def validate_alias(alias: Optional[str], config: AppConfig) -> ValidationResult:
     if alias is None:
         return ValidationResult(True)
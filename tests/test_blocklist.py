@@ -0,0 +1,91 @@
+import dataclasses
+import pathlib
+import sys
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.append(str(SRC_PATH))
+
+import pytest
+
+from utils.blocklist import DomainBlocklist, compile_blocklist
+from utils.config import load_config
+from utils.validators import validate_url
+
+
+def build(tmp_path, hosts):
+    path = tmp_path / "blocklist.bin"
+    compile_blocklist(hosts, str(path))
+    return str(path)
+
+
+def test_blocklist_matches_host_and_parent_domains(tmp_path):
+    blocklist = DomainBlocklist(build(tmp_path, ["Evil.example", "*.phish.test.", "bad.org"]))
+    assert blocklist.count == 3
+    assert blocklist.match("evil.example") == "evil.example"
+    assert blocklist.match("login.EVIL.example") == "evil.example"
+    assert blocklist.match("a.b.phish.test") == "phish.test"
+    assert blocklist.match("notevil.example") is None
+    assert blocklist.match("example") is None
+
+
+def test_blocklist_handles_large_lists(tmp_path):
+    hosts = [f"host{idx}.malware.test" for idx in range(20000)]
+    blocklist = DomainBlocklist(build(tmp_path, hosts))
+    assert blocklist.match("cdn.host19999.malware.test") == "host19999.malware.test"
+    assert blocklist.match("host20000.malware.test") is None
+
+
+def test_validate_url_rejects_blocked_destination(tmp_path):
+    config = dataclasses.replace(load_config(), blocklist_path=build(tmp_path, ["evil.example"]))
+    result = validate_url("https://www.evil.example/login", config)
+    assert not result.is_valid
+    assert result.code == "BLOCKED_DESTINATION"
+    assert validate_url("https://example.com", config).is_valid
+
+
+def test_blocklist_matches_unicode_and_punycode_spellings(tmp_path):
+    blocklist = DomainBlocklist(build(tmp_path, ["xn--pple-43d.example", "bücher.test", "bad..label"]))
+    assert blocklist.count == 2
+    assert blocklist.match("login.аpple.example") == "xn--pple-43d.example"
+    assert blocklist.match("xn--bcher-kva.test") == "xn--bcher-kva.test"
+    assert blocklist.match("BÜCHER.test") == "xn--bcher-kva.test"
+
+
+def test_validate_url_blocks_unicode_host_listed_in_punycode(tmp_path):
+    config = dataclasses.replace(load_config(), blocklist_path=build(tmp_path, ["xn--pple-43d.example"]))
+    result = validate_url("https://аpple.example/signin", config)
+    assert result.code == "BLOCKED_DESTINATION"
+
+
+def test_validate_url_rejects_hosts_browsers_parse_differently(tmp_path):
+    config = dataclasses.replace(load_config(), blocklist_path=build(tmp_path, ["evil.example"]))
+    for url in (
+        "https://evil.example\\@good.com/",
+        "https://evil.example\\.good.com",
+        "https://evil%2Eexample/",
+        "https://evil.example%2F@good.com/",
+        "https://evil。example/",
+        "https://evil.ex ample/",
+    ):
+        assert not validate_url(url, config).is_valid, url
+    assert validate_url("https://good.com/path\\with%20escapes?q=%2E", config).is_valid
+    assert validate_url("http://[2001:db8::1]:8080/", config).is_valid
+
+
+def test_blocklist_rejects_truncated_or_foreign_artifacts(tmp_path):
+    path = pathlib.Path(build(tmp_path, ["evil.example", "bad.org"]))
+    data = path.read_bytes()
+    for name, payload in (
+        ("truncated.bin", data[:-8]),
+        ("padded.bin", data + b"\0" * 8),
+        ("header-only.bin", data[:16]),
+        ("foreign.bin", b"XXXX" + data[4:]),
+    ):
+        broken = tmp_path / name
+        broken.write_bytes(payload)
+        with pytest.raises(ValueError):
+            DomainBlocklist(str(broken))
+    with pytest.raises(OSError):
+        DomainBlocklist(str(tmp_path / "missing.bin"))
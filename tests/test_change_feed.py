@@ -0,0 +1,82 @@
+import pathlib
+import sys
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.append(str(SRC_PATH))
+
+from models.change_feed import ChangeFeedPoller
+from models.link_cache import LinkCache
+
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class Feed:
+    def __init__(self):
+        self.buckets = {}
+        self.fetches = []
+
+    def __call__(self, buckets):
+        self.fetches.append(buckets)
+        return [change for bucket in buckets for change in self.buckets.get(bucket, [])]
+
+
+def build(feed, clock, cache):
+    return ChangeFeedPoller(feed, cache, bucket_seconds=10, poll_seconds=5, clock=clock)
+
+
+def test_poll_drops_older_cached_versions():
+    clock = Clock(1000.0)
+    cache = LinkCache(clock=clock)
+    cache.put("abc", {"code": "abc", "version": 1})
+    cache.put("xyz", {"code": "xyz", "version": 3})
+    feed = Feed()
+    feed.buckets[100] = [{"code": "abc", "version": 2}, {"code": "xyz", "version": 3}]
+    poller = build(feed, clock, cache)
+
+    assert poller.maybe_poll() == 1
+    assert cache.get("abc") is None
+    assert cache.get("xyz") is not None
+    assert feed.fetches == [[99, 100]]
+
+
+def test_poll_is_throttled_and_rereads_previous_bucket():
+    clock = Clock(1000.0)
+    cache = LinkCache(clock=clock)
+    feed = Feed()
+    poller = build(feed, clock, cache)
+    poller.maybe_poll()
+
+    cache.put("abc", {"code": "abc", "version": 1})
+    feed.buckets[100] = [{"code": "abc", "version": 2}]
+    clock.now = 1002.0
+    assert poller.maybe_poll() == 0
+    assert cache.get("abc") is not None
+
+    clock.now = 1012.0
+    assert poller.maybe_poll() == 1
+    assert cache.get("abc") is None
+    assert feed.fetches[-1] == [99, 100, 101]
+
+
+def test_long_gap_expires_cache_and_reads_a_bounded_window():
+    clock = Clock(1000.0)
+    cache = LinkCache(clock=clock)
+    feed = Feed()
+    poller = build(feed, clock, cache)
+    poller.maybe_poll()
+    cache.put("abc", {"code": "abc", "version": 1})
+
+    clock.now = 1295.0
+    poller.maybe_poll()
+    assert cache.get("abc", max_age=300) is None
+    assert cache.get("abc") == {"code": "abc", "version": 1}
+    assert len(feed.fetches) == 2
+    assert feed.fetches[-1] == [128, 129]
@@ -0,0 +1,193 @@
+import pathlib
+import sys
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.append(str(SRC_PATH))
+
+from models.click_aggregator import ClickAggregator
+from models.click_events import ClickEvent, ClickEventBuffer, SegmentedFileClickSink, visitor_digest
+from utils.hyperloglog import HyperLogLog
+
+
+SECRET = b"test-secret"
+
+
+def request(ip, referrer=None, country="US"):
+    headers = {"User-Agent": "pytest", "CloudFront-Viewer-Country": country}
+    if referrer:
+        headers["Referer"] = referrer
+    return {"headers": headers, "requestContext": {"identity": {"sourceIp": ip}}}
+
+
+def test_click_event_record_round_trip():
+    event = ClickEvent.from_request("abc", request("10.0.0.1", "https://news.example"), 1700000000, SECRET)
+    assert "10.0.0.1" not in event.to_record()
+    assert ClickEvent.from_record(event.to_record()) == event
+
+
+def test_buffer_segments_and_aggregator(tmp_path):
+    sink = SegmentedFileClickSink(str(tmp_path), segment_bytes=512)
+    buffer = ClickEventBuffer(sink, batch_size=1000, max_age_seconds=60)
+    for idx in range(30):
+        buffer.append(ClickEvent.from_request("abc", request(f"10.0.0.{idx % 10}", country="DE"), 1700000000 + idx, SECRET))
+    buffer.append(ClickEvent.from_request("xyz", request("10.0.1.1"), 1700000100, SECRET))
+    assert buffer.flush() == 31
+    buffer.close()
+
+    aggregator = ClickAggregator()
+    segments = aggregator.fold_directory(str(tmp_path))
+    assert segments
+    rollup = aggregator.rollups["abc"].to_dict()
+    assert rollup["clicks"] == 30
+    assert rollup["uniqueVisitors"] == 10
+    assert rollup["countries"] == {"DE": 30}
+    assert rollup["firstSeen"] == 1700000000
+    assert aggregator.rollups["xyz"].clicks == 1
+
+
+def test_buffer_requeues_on_sink_failure():
+    class FlakySink:
+        def __init__(self):
+            self.fail = True
+            self.records = []
+
+        def write_batch(self, records):
+            if self.fail:
+                raise RuntimeError("down")
+            self.records.extend(records)
+            return []
+
+    sink = FlakySink()
+    buffer = ClickEventBuffer(sink, batch_size=1000, max_age_seconds=60)
+    buffer.append(ClickEvent("abc", 1))
+    assert buffer.flush() == 0
+    sink.fail = False
+    assert buffer.flush() == 1
+    assert sink.records == ['{"c":"abc","t":1}']
+
+
+def test_flush_if_due_never_waits_and_backs_off_after_failure():
+    class SlowSink:
+        def __init__(self):
+            self.fail = False
+            self.batches = []
+
+        def write_batch(self, records):
+            if self.fail:
+                raise RuntimeError("timeout")
+            self.batches.append(records)
+            return []
+
+        def rotate(self, force=False):
+            pass
+
+    sink = SlowSink()
+    buffer = ClickEventBuffer(sink, batch_size=2, max_age_seconds=60, background=False)
+    for idx in range(5):
+        buffer.append(ClickEvent("abc", idx))
+
+    with buffer._flush_lock:
+        assert buffer.flush_if_due() == 0
+    assert buffer.flush_if_due() == 2
+    assert sink.batches == [['{"c":"abc","t":0}', '{"c":"abc","t":1}']]
+
+    sink.fail = True
+    assert buffer.flush_if_due() == 0
+    sink.fail = False
+    assert buffer.flush_if_due() == 0
+    assert len(sink.batches) == 1
+    assert buffer.flush() == 3
+
+
+def test_hyperloglog_estimate_within_error():
+    sketch = HyperLogLog()
+    for value in range(50000):
+        sketch.add(int(ClickEvent.from_request("a", request(str(value)), 0, SECRET).visitor, 16))
+    assert abs(sketch.count() - 50000) / 50000 < 0.05
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_segments_are_sealed_by_age(tmp_path):
+    clock = Clock()
+    sink = SegmentedFileClickSink(str(tmp_path), segment_bytes=1 << 20, segment_seconds=30, clock=clock)
+    buffer = ClickEventBuffer(sink, batch_size=1, max_age_seconds=60, background=False)
+    buffer.append(ClickEvent("abc", 1))
+    assert buffer.flush_if_due() == 1
+    assert list(tmp_path.glob("*.jsonl")) == []
+
+    clock.now = 31
+    buffer.flush_if_due()
+    assert len(list(tmp_path.glob("*.jsonl"))) == 1
+    assert list(tmp_path.glob("*.open")) == []
+
+
+def test_flush_if_due_waits_for_a_full_batch(tmp_path):
+    sink = SegmentedFileClickSink(str(tmp_path))
+    buffer = ClickEventBuffer(sink, batch_size=3, max_age_seconds=60, background=False)
+    buffer.append(ClickEvent("abc", 1))
+    assert buffer.flush_if_due() == 0
+    buffer.append(ClickEvent("abc", 2))
+    buffer.append(ClickEvent("abc", 3))
+    assert buffer.flush_if_due() == 3
+
+
+def test_aggregator_state_merges_across_runs(tmp_path):
+    segments = tmp_path / "segments"
+    state = str(tmp_path / "rollups.json")
+    for batch in (range(0, 20), range(10, 30)):
+        sink = SegmentedFileClickSink(str(segments))
+        sink.write_batch([ClickEvent.from_request("abc", request(f"10.0.0.{idx}"), 1700000000 + idx, SECRET).to_record() for idx in batch])
+        sink.rotate(force=True)
+        aggregator = ClickAggregator()
+        aggregator.load_state(state)
+        for path in aggregator.fold_directory(str(segments)):
+            pathlib.Path(path).unlink()
+        aggregator.save_state(state)
+
+    merged = ClickAggregator()
+    merged.load_state(state)
+    rollup = merged.rollups["abc"].to_dict()
+    assert rollup["clicks"] == 40
+    assert rollup["uniqueVisitors"] == 30
+    assert rollup["firstSeen"] == 1700000000
+    assert rollup["lastSeen"] == 1700000029
+
+
+def test_aggregator_state_skips_segments_already_folded(tmp_path):
+    segments = tmp_path / "segments"
+    state = str(tmp_path / "rollups.json")
+    sink = SegmentedFileClickSink(str(segments))
+    sink.write_batch([ClickEvent("abc", idx).to_record() for idx in range(5)])
+    sink.rotate(force=True)
+
+    for _ in range(3):
+        aggregator = ClickAggregator()
+        aggregator.load_state(state)
+        assert len(aggregator.fold_directory(str(segments))) == 1
+        aggregator.save_state(state)
+    assert aggregator.rollups["abc"].clicks == 5
+
+    for path in segments.glob("*.jsonl"):
+        path.unlink()
+    aggregator = ClickAggregator()
+    aggregator.load_state(state)
+    aggregator.fold_directory(str(segments))
+    assert aggregator.consumed == set()
+    assert aggregator.rollups["abc"].clicks == 5
+
+
+def test_visitor_digest_is_keyed_and_rotates_daily():
+    base = visitor_digest(SECRET, 1700000000, "10.0.0.1", "pytest")
+    assert base == visitor_digest(SECRET, 1700000001, "10.0.0.1", "pytest")
+    assert base != visitor_digest(b"other-secret", 1700000000, "10.0.0.1", "pytest")
+    assert base != visitor_digest(SECRET, 1700000000 + 86400, "10.0.0.1", "pytest")
+    assert ClickEvent.from_request("abc", request("10.0.0.1"), 1700000000).visitor is None
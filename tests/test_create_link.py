@@ -1,3 +1,4 @@
+import dataclasses
 import json
 import pathlib
 import sys
@@ -9,6 +10,7 @@ if str(SRC_PATH) not in sys.path:
     sys.path.append(str(SRC_PATH))
 
 from handlers import create_link
+from utils.blocklist import compile_blocklist
 
 
 class FakeRepo:
@@ -50,3 +52,15 @@ def test_create_link_invalid_url(monkeypatch):
     body = json.loads(response["body"])
     assert response["statusCode"] == 400
     assert body["error"]["code"] == "INVALID_URL"
+
+
+def test_create_link_blocked_destination(monkeypatch, tmp_path):
+    path = tmp_path / "blocklist.bin"
+    compile_blocklist(["evil.example"], str(path))
+    monkeypatch.setattr(create_link, "CONFIG", dataclasses.replace(create_link.CONFIG, blocklist_path=str(path)))
+    monkeypatch.setattr(create_link, "get_repository", lambda: FakeRepo())
+    event = {"body": json.dumps({"destination": "https://login.evil.example/"})}
+    response = create_link.handler(event, SimpleNamespace(aws_request_id="test"))
+    body = json.loads(response["body"])
+    assert response["statusCode"] == 400
+    assert body["error"]["code"] == "BLOCKED_DESTINATION"
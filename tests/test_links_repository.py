@@ -0,0 +1,158 @@
+import pathlib
+import sys
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.append(str(SRC_PATH))
+
+import pytest
+from botocore.exceptions import ClientError
+
+from models import links_repository
+from models.links_repository import CHANGE_FEED_SHARDS, LinkOwnershipError, LinksRepository
+from utils.config import load_config
+
+CONDITIONAL_FAILED = ClientError(
+    {"Error": {"Code": "ConditionalCheckFailedException"}, "ResponseMetadata": {"HTTPStatusCode": 400}},
+    "UpdateItem",
+)
+
+
+class StubTable:
+    def __init__(self):
+        self.updates = []
+        self.item = None
+        self.fail_next_update = False
+
+    def update_item(self, **kwargs):
+        self.updates.append(kwargs)
+        if self.fail_next_update:
+            self.fail_next_update = False
+            raise CONDITIONAL_FAILED
+        return {"Attributes": {"code": "abc", "version": 4}}
+
+    def get_item(self, **kwargs):
+        return {"Item": self.item} if self.item else {}
+
+
+class StubResource:
+    def __init__(self, table):
+        self.table = table
+        self.batches = []
+        self.responses = []
+
+    def Table(self, name):
+        return self.table
+
+    def batch_get_item(self, RequestItems):
+        self.batches.append(RequestItems)
+        return self.responses.pop(0)
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    table = StubTable()
+    resource = StubResource(table)
+    monkeypatch.setattr(links_repository.boto3, "resource", lambda *args, **kwargs: resource)
+    return LinksRepository(load_config()), table, resource
+
+
+def test_update_link_bumps_version_and_publishes_invalidation(stub):
+    repo, table, _ = stub
+    record = repo.update_link("abc", destination="https://example.org", expected_version=3)
+
+    assert record["version"] == 4
+    update, publish = table.updates
+    assert update["Key"] == {"PK": "LINK#abc", "SK": "METADATA"}
+    assert update["UpdateExpression"] == (
+        "SET version = if_not_exists(version, :zero) + :one, updatedAt = :now, destination = :destination"
+    )
+    assert update["ConditionExpression"] == "attribute_exists(PK) AND version = :expected"
+    assert update["ExpressionAttributeValues"][":expected"] == 3
+    assert update["ExpressionAttributeValues"][":destination"] == "https://example.org"
+    assert "ExpressionAttributeNames" not in update
+
+    assert publish["Key"]["PK"].startswith("CHANGES#")
+    assert publish["Key"]["PK"].endswith(f"#{repo.change_shard('abc')}")
+    assert publish["Key"]["SK"] == "FEED"
+    assert publish["UpdateExpression"].startswith("SET changes = list_append(if_not_exists(changes, :empty), :entry)")
+    assert publish["ExpressionAttributeValues"][":entry"][0]["code"] == "abc"
+    assert publish["ExpressionAttributeValues"][":entry"][0]["version"] == 4
+
+
+def test_expected_version_zero_targets_pre_versioning_links(stub):
+    repo, table, _ = stub
+    repo.update_link("abc", disabled=True, expected_version=0)
+    update = table.updates[0]
+    assert update["ConditionExpression"] == "attribute_exists(PK) AND attribute_not_exists(version)"
+    assert ":expected" not in update["ExpressionAttributeValues"]
+    assert update["ExpressionAttributeValues"][":disabled"] is True
+
+
+def test_owner_condition(stub):
+    repo, table, _ = stub
+    repo.update_link("abc", disabled=True, owner="alice")
+    update = table.updates[0]
+    assert update["ConditionExpression"] == (
+        "attribute_exists(PK) AND #owner = :owner AND ownerVerified = :verified"
+    )
+    assert update["ExpressionAttributeNames"] == {"#owner": "owner"}
+    assert update["ExpressionAttributeValues"][":owner"] == "alice"
+
+
+def test_conditional_failure_for_missing_link_returns_none(stub):
+    repo, table, _ = stub
+    table.fail_next_update = True
+    assert repo.update_link("abc", disabled=True, expected_version=2) is None
+    assert len(table.updates) == 1
+
+
+def test_conditional_failure_for_stale_version_raises_conflict(stub):
+    repo, table, _ = stub
+    table.item = {"code": "abc", "version": 5, "owner": "alice", "ownerVerified": True}
+    table.fail_next_update = True
+    with pytest.raises(ValueError):
+        repo.update_link("abc", disabled=True, expected_version=2, owner="alice")
+
+
+def test_conditional_failure_for_other_owner_raises_ownership_error(stub):
+    repo, table, _ = stub
+    table.item = {"code": "abc", "version": 1, "owner": "anonymous"}
+    table.fail_next_update = True
+    with pytest.raises(LinkOwnershipError):
+        repo.update_link("abc", disabled=True, owner="anonymous")
+
+
+def test_read_changes_batches_bucket_shards_and_retries_unprocessed(stub):
+    repo, _, resource = stub
+    name = load_config().table_name
+    resource.responses = [
+        {
+            "Responses": {name: [{"changes": [{"code": "abc", "version": 2}]}]},
+            "UnprocessedKeys": {name: {"Keys": [{"PK": "CHANGES#101#3", "SK": "FEED"}]}},
+        },
+        {"Responses": {name: [{"changes": [{"code": "xyz", "version": 3}]}]}},
+    ]
+    changes = repo.read_changes([100, 101])
+
+    assert [change["code"] for change in changes] == ["abc", "xyz"]
+    keys = resource.batches[0][name]["Keys"]
+    assert len(keys) == 2 * CHANGE_FEED_SHARDS
+    assert keys[0] == {"PK": "CHANGES#100#0", "SK": "FEED"}
+    assert keys[-1] == {"PK": f"CHANGES#101#{CHANGE_FEED_SHARDS - 1}", "SK": "FEED"}
+    assert len(resource.batches) == 2
+
+
+def test_read_changes_splits_batches_at_the_key_limit(stub):
+    repo, _, resource = stub
+    name = load_config().table_name
+    resource.responses = [{"Responses": {name: []}} for _ in range(2)]
+    repo.read_changes(list(range(100, 107)))
+    assert [len(batch[name]["Keys"]) for batch in resource.batches] == [100, 7 * CHANGE_FEED_SHARDS - 100]
+
+
+def test_invalidations_spread_across_shards(stub):
+    repo, _, _ = stub
+    shards = {repo.change_shard(f"code{idx}") for idx in range(1000)}
+    assert shards == set(range(CHANGE_FEED_SHARDS))
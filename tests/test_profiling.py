@@ -0,0 +1,60 @@
+import json
+import pathlib
+import sys
+import time
+from types import SimpleNamespace
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.append(str(SRC_PATH))
+
+from utils.profiling import InvocationProfiler, LocalDirProfileSink, phase
+
+
+class MemorySink:
+    def __init__(self):
+        self.written = []
+
+    def write(self, name, collapsed, metadata):
+        self.written.append((name, collapsed, metadata))
+
+
+def slow_handler(event, context):
+    with phase("work"):
+        time.sleep(0.05)
+    return {"statusCode": 200}
+
+
+def fast_handler(event, context):
+    return {"statusCode": 200}
+
+
+def test_slow_invocation_is_captured():
+    sink = MemorySink()
+    profiler = InvocationProfiler(sink, threshold_ms=10, interval_ms=1)
+    handler = profiler.wrap("slow", slow_handler)
+    assert handler({}, SimpleNamespace(aws_request_id="req-1")) == {"statusCode": 200}
+
+    name, collapsed, metadata = sink.written[0]
+    assert name == "slow-req-1"
+    assert "slow_handler" in collapsed
+    assert metadata["trigger"] == "threshold"
+    assert metadata["phases"]["work"] >= 40
+
+
+def test_fast_invocation_is_not_captured():
+    sink = MemorySink()
+    profiler = InvocationProfiler(sink, threshold_ms=1000, interval_ms=1)
+    profiler.wrap("fast", fast_handler)({}, SimpleNamespace(aws_request_id="req-2"))
+    assert sink.written == []
+
+
+def test_sampled_invocation_written_to_local_dir(tmp_path):
+    profiler = InvocationProfiler(LocalDirProfileSink(str(tmp_path)), threshold_ms=1000, sample_rate=1.0, interval_ms=1)
+    profiler.wrap("slow", slow_handler)({}, SimpleNamespace(aws_request_id="req-3"))
+
+    metadata = json.loads((tmp_path / "slow-req-3.json").read_text())
+    assert metadata["trigger"] == "sample"
+    lines = (tmp_path / "slow-req-3.collapsed").read_text().splitlines()
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
@@ -0,0 +1,232 @@
+import pathlib
+import sys
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.append(str(SRC_PATH))
+
+import pytest
+from botocore.exceptions import ClientError
+
+from models.change_feed import ChangeFeedPoller
+from models.link_cache import LinkCache
+from models.links_repository import is_backend_failure
+from models.resilient_repository import BackendUnavailableError, ResilientLinksRepository
+from utils.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def client_error(code, status=400):
+    return ClientError({"Error": {"Code": code}, "ResponseMetadata": {"HTTPStatusCode": status}}, "GetItem")
+
+
+class FlakyRepo:
+    def __init__(self):
+        self.healthy = True
+        self.calls = 0
+        self.clicks = {}
+        self.item = {"code": "abc", "destination": "https://example.com", "expiresAt": 9999999999, "clicks": 0}
+
+    def _check(self):
+        self.calls += 1
+        if not self.healthy:
+            raise client_error("ProvisionedThroughputExceededException")
+
+    def get_link(self, code):
+        self._check()
+        return dict(self.item) if code == "abc" else None
+
+    def increment_clicks(self, code, amount=1):
+        self._check()
+        self.clicks[code] = self.clicks.get(code, 0) + amount
+        return dict(self.item, clicks=self.clicks[code])
+
+    def read_changes(self, buckets):
+        self._check()
+        return []
+
+    def save_click(self, item):
+        pass
+
+
+def build(clock):
+    repo = FlakyRepo()
+    breaker = CircuitBreaker(
+        "test", window=4, min_calls=2, error_rate=0.5, open_seconds=10, is_failure=is_backend_failure, clock=clock
+    )
+    return repo, breaker, ResilientLinksRepository(repo, breaker, LinkCache(10))
+
+
+def test_breaker_trips_and_serves_stale_record():
+    clock = Clock()
+    repo, breaker, resilient = build(clock)
+    assert resilient.get_link("abc")["destination"] == "https://example.com"
+
+    repo.healthy = False
+    for _ in range(2):
+        assert resilient.get_link("abc")["destination"] == "https://example.com"
+    assert breaker.state == OPEN
+
+    calls = repo.calls
+    assert resilient.get_link("abc")["code"] == "abc"
+    assert resilient.increment_clicks("abc")["code"] == "abc"
+    assert repo.calls == calls
+    assert resilient.deferred_clicks == 1
+
+    with pytest.raises(BackendUnavailableError):
+        resilient.get_link("unknown")
+
+
+def test_breaker_recovers_and_replays_deferred_clicks():
+    clock = Clock()
+    repo, breaker, resilient = build(clock)
+    resilient.get_link("abc")
+    repo.healthy = False
+    resilient.increment_clicks("abc")
+    resilient.increment_clicks("abc")
+    assert breaker.state == OPEN
+    resilient.increment_clicks("abc")
+    assert resilient.deferred_clicks == 3
+
+    repo.healthy = True
+    clock.now = 11
+    assert breaker.state == HALF_OPEN
+    resilient.increment_clicks("abc")
+    assert breaker.state == CLOSED
+    assert resilient.deferred_clicks == 0
+    assert repo.clicks["abc"] == 4
+
+
+def test_breaker_trips_on_latency():
+    clock = Clock()
+    breaker = CircuitBreaker("slow", window=4, min_calls=2, latency_ms=100, clock=clock)
+
+    def slow_call():
+        clock.now += 0.5
+
+    breaker.call(slow_call)
+    breaker.call(slow_call)
+    assert breaker.state == OPEN
+
+
+def test_fresh_cache_serves_reads_until_invalidated():
+    clock = Clock()
+    repo = FlakyRepo()
+    breaker = CircuitBreaker("test", clock=clock)
+    cache = LinkCache(10, clock=clock)
+    resilient = ResilientLinksRepository(repo, breaker, cache, fresh_seconds=60)
+
+    resilient.get_link("abc")
+    resilient.get_link("abc")
+    assert repo.calls == 1
+
+    cache.discard("abc")
+    repo.item["destination"] = "https://example.org"
+    assert resilient.get_link("abc")["destination"] == "https://example.org"
+    assert repo.calls == 2
+
+    clock.now = 61
+    resilient.get_link("abc")
+    assert repo.calls == 3
+
+
+def test_caller_errors_do_not_trip_breaker():
+    clock = Clock()
+    repo, breaker, resilient = build(clock)
+
+    def invalid_key(code):
+        raise client_error("ValidationException")
+
+    repo.get_link = invalid_key
+    for _ in range(5):
+        with pytest.raises(ClientError):
+            resilient.get_link("x" * 3000)
+    assert breaker.state == CLOSED
+
+
+def test_is_backend_failure_classification():
+    assert is_backend_failure(client_error("ThrottlingException"))
+    assert is_backend_failure(client_error("InternalFailure", status=500))
+    assert not is_backend_failure(client_error("ValidationException"))
+    assert not is_backend_failure(ValueError("bad"))
+
+
+def test_failed_read_skips_increment_call():
+    clock = Clock()
+    repo, breaker, resilient = build(clock)
+    resilient.get_link("abc")
+    repo.healthy = False
+    resilient.get_link("abc")
+    calls = repo.calls
+    assert resilient.increment_clicks("abc")["code"] == "abc"
+    assert repo.calls == calls
+    assert resilient.deferred_clicks == 1
+
+
+def test_replay_drops_codes_rejected_as_invalid():
+    clock = Clock()
+    repo, breaker, resilient = build(clock)
+    increment = repo.increment_clicks
+
+    def increment_or_reject(code, amount=1):
+        if code == "gone":
+            raise client_error("ValidationException")
+        return increment(code, amount)
+
+    repo.increment_clicks = increment_or_reject
+    resilient._defer("gone", 2)
+    resilient._defer("xyz", 3)
+    resilient.increment_clicks("abc")
+
+    assert resilient.deferred_clicks == 0
+    assert repo.clicks == {"abc": 1, "xyz": 3}
+    assert breaker.state == CLOSED
+
+
+def test_replay_respects_time_budget():
+    repo = FlakyRepo()
+    breaker = CircuitBreaker("test", is_failure=is_backend_failure)
+    resilient = ResilientLinksRepository(repo, breaker, LinkCache(10), replay_budget_ms=0)
+    resilient._defer("xyz", 3)
+    resilient.increment_clicks("abc")
+    assert resilient.deferred_clicks == 3
+
+
+def test_change_feed_gap_during_outage_keeps_fallback_records():
+    clock = Clock()
+    clock.now = 1000.0
+    repo = FlakyRepo()
+    breaker = CircuitBreaker(
+        "test", window=4, min_calls=2, open_seconds=30, is_failure=is_backend_failure, clock=clock
+    )
+    cache = LinkCache(10, clock=clock)
+    feed = ChangeFeedPoller(
+        lambda buckets: breaker.call(repo.read_changes, buckets),
+        cache,
+        bucket_seconds=10,
+        poll_seconds=5,
+        clock=clock,
+    )
+    resilient = ResilientLinksRepository(repo, breaker, cache, fresh_seconds=300, change_feed=feed)
+    resilient.get_link("abc")
+
+    repo.healthy = False
+    # Longer than max_catchup_buckets * bucket_seconds, so the poller sees a gap.
+    for step in range(1, 19):
+        clock.now = 1000.0 + 5 * step
+        assert resilient.get_link("abc")["destination"] == "https://example.com"
+    assert breaker.state != CLOSED
+
+    repo.healthy = True
+    repo.item["destination"] = "https://example.org"
+    clock.now += 30
+    assert resilient.get_link("abc")["destination"] == "https://example.org"
+    assert breaker.state == CLOSED
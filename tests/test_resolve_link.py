@@ -9,6 +9,7 @@ if str(SRC_PATH) not in sys.path:
     sys.path.append(str(SRC_PATH))
 
 from handlers import resolve_link
+from models.resilient_repository import BackendUnavailableError
 
 
 class Repo:
@@ -52,3 +53,54 @@ def test_resolve_link_not_found(monkeypatch):
     body = json.loads(response["body"])
     assert response["statusCode"] == 404
     assert body["error"]["code"] == "NOT_FOUND"
+
+
+def test_resolve_link_records_click_event(monkeypatch):
+    class Buffer:
+        def __init__(self):
+            self.events = []
+
+        def append(self, event):
+            self.events.append(event)
+
+        def flush_in_background(self):
+            self.kicked = True
+
+        def flush_if_due(self):
+            self.flushed = True
+
+    repo = Repo()
+    buffer = Buffer()
+    monkeypatch.setattr(resolve_link, "get_repository", lambda: repo)
+    monkeypatch.setattr(resolve_link, "get_click_buffer", lambda: buffer)
+    event = {"pathParameters": {"code": "abc"}, "headers": {"Referer": "https://news.example"}}
+    response = resolve_link.handler(event, SimpleNamespace(aws_request_id="req"))
+    assert response["statusCode"] == 302
+    assert buffer.events[0].code == "abc"
+    assert buffer.events[0].referrer == "https://news.example"
+    assert buffer.kicked
+    assert buffer.flushed
+
+
+def test_resolve_link_backend_unavailable(monkeypatch):
+    class DownRepo(Repo):
+        def get_link(self, code):
+            raise BackendUnavailableError("down")
+
+    monkeypatch.setattr(resolve_link, "get_repository", lambda: DownRepo())
+    event = {"pathParameters": {"code": "abc"}}
+    response = resolve_link.handler(event, SimpleNamespace(aws_request_id="req"))
+    body = json.loads(response["body"])
+    assert response["statusCode"] == 503
+    assert body["error"]["code"] == "BACKEND_UNAVAILABLE"
+
+
+def test_resolve_link_disabled(monkeypatch):
+    repo = Repo()
+    repo.item["disabled"] = True
+    monkeypatch.setattr(resolve_link, "get_repository", lambda: repo)
+    event = {"pathParameters": {"code": "abc"}}
+    response = resolve_link.handler(event, SimpleNamespace(aws_request_id="req"))
+    body = json.loads(response["body"])
+    assert response["statusCode"] == 410
+    assert body["error"]["code"] == "LINK_DISABLED"
@@ -0,0 +1,126 @@
+import json
+import pathlib
+import sys
+from types import SimpleNamespace
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.append(str(SRC_PATH))
+
+from handlers import update_link
+from models.links_repository import LinkOwnershipError
+
+
+class Repo:
+    def __init__(self):
+        self.item = {
+            "code": "abc",
+            "destination": "https://example.com",
+            "expiresAt": 9999999999,
+            "version": 1,
+            "owner": "alice",
+        }
+        self.calls = []
+
+    def update_link(self, code, destination=None, disabled=None, expected_version=None, owner=None):
+        self.calls.append((code, destination, disabled, expected_version, owner))
+        if code != self.item["code"]:
+            return None
+        if owner is not None and owner != self.item["owner"]:
+            raise LinkOwnershipError("Caller does not own this link")
+        if expected_version is not None and expected_version != self.item["version"]:
+            raise ValueError("Link version has changed")
+        if destination is not None:
+            self.item["destination"] = destination
+        if disabled is not None:
+            self.item["disabled"] = disabled
+        self.item["version"] += 1
+        return dict(self.item)
+
+
+def invoke(event, caller="alice", groups=None):
+    if caller:
+        claims = {"cognito:username": caller}
+        if groups:
+            claims["cognito:groups"] = groups
+        event["requestContext"] = {"authorizer": {"claims": claims}}
+    response = update_link.handler(event, SimpleNamespace(aws_request_id="req"))
+    return response["statusCode"], json.loads(response["body"])
+
+
+def test_update_link_changes_destination(monkeypatch):
+    repo = Repo()
+    monkeypatch.setattr(update_link, "get_repository", lambda: repo)
+    status, body = invoke(
+        {
+            "httpMethod": "PATCH",
+            "pathParameters": {"code": "abc"},
+            "body": json.dumps({"destination": "https://example.org", "expectedVersion": 1}),
+        }
+    )
+    assert status == 200
+    assert body["destination"] == "https://example.org"
+    assert body["version"] == 2
+
+
+def test_update_link_version_conflict(monkeypatch):
+    monkeypatch.setattr(update_link, "get_repository", lambda: Repo())
+    status, body = invoke(
+        {
+            "httpMethod": "PATCH",
+            "pathParameters": {"code": "abc"},
+            "body": json.dumps({"disabled": True, "expectedVersion": 7}),
+        }
+    )
+    assert status == 409
+    assert body["error"]["code"] == "VERSION_CONFLICT"
+
+
+def test_delete_disables_link(monkeypatch):
+    repo = Repo()
+    monkeypatch.setattr(update_link, "get_repository", lambda: repo)
+    status, body = invoke({"httpMethod": "DELETE", "pathParameters": {"code": "abc"}})
+    assert status == 200
+    assert body["disabled"] is True
+    assert repo.calls == [("abc", None, True, None, "alice")]
+
+
+def test_update_link_not_found(monkeypatch):
+    monkeypatch.setattr(update_link, "get_repository", lambda: Repo())
+    status, body = invoke(
+        {"httpMethod": "PATCH", "pathParameters": {"code": "nope"}, "body": json.dumps({"disabled": True})}
+    )
+    assert status == 404
+    assert body["error"]["code"] == "NOT_FOUND"
+
+
+def test_update_link_requires_authentication(monkeypatch):
+    repo = Repo()
+    monkeypatch.setattr(update_link, "get_repository", lambda: repo)
+    status, body = invoke({"httpMethod": "DELETE", "pathParameters": {"code": "abc"}}, caller=None)
+    assert status == 401
+    assert body["error"]["code"] == "UNAUTHORIZED"
+    assert repo.calls == []
+
+
+def test_update_link_rejects_non_owner(monkeypatch):
+    monkeypatch.setattr(update_link, "get_repository", lambda: Repo())
+    status, body = invoke(
+        {"httpMethod": "PATCH", "pathParameters": {"code": "abc"}, "body": json.dumps({"destination": "https://evil.example"})},
+        caller="mallory",
+    )
+    assert status == 403
+    assert body["error"]["code"] == "FORBIDDEN"
+
+
+def test_admin_can_disable_any_link(monkeypatch):
+    repo = Repo()
+    monkeypatch.setattr(update_link, "get_repository", lambda: repo)
+    status, body = invoke(
+        {"httpMethod": "DELETE", "pathParameters": {"code": "abc"}},
+        caller="trust-safety",
+        groups="[link-admins, ops]",
+    )
+    assert status == 200
+    assert repo.calls == [("abc", None, True, None, None)]